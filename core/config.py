@@ -50,6 +50,12 @@ class Config(BaseModel):
     enable_skills: bool = True
     skills_refresh_on_call: bool = False
     enable_tracing: bool = True
+    # Stream model responses and start Read/Grep/Glob calls once their arguments complete.
+    stream_tool_dispatch: bool = False
+    # Keep system + history byte-stable for prefix caching; MiniMax's merged system messages still vary.
+    stable_prefix_context: bool = False
+    # When Edit's renames reach disk: always, group (~50 ms windows) or on_run_end; see DurabilityPolicy.
+    workspace_durability: str = "always"
     
     @classmethod
     def from_env(cls) -> "Config":
@@ -71,6 +77,9 @@ class Config(BaseModel):
             enable_skills=_env_flag("ENABLE_SKILLS", True),
             skills_refresh_on_call=_env_flag("SKILLS_REFRESH_ON_CALL", False),
             enable_tracing=_env_flag("ENABLE_TRACING", True),
+            stream_tool_dispatch=_env_flag("STREAM_TOOL_DISPATCH", False),
+            stable_prefix_context=_env_flag("STABLE_PREFIX_CONTEXT", False),
+            workspace_durability=os.getenv("WORKSPACE_DURABILITY", "always").strip().lower(),
         )
     
     def to_dict(self) -> Dict[str, Any]:
@@ -4,6 +4,7 @@ import json
 import logging
 import os
 import time
+from functools import partial
 from types import MappingProxyType
 from typing import Any, Callable, Iterator, Literal, Optional
 
@@ -101,6 +102,49 @@ def extract_tool_calls(response: Any) -> list[dict[str, Any]]:
     return []
 
 
+def assemble_stream_response(
+    chunks: Any, on_tool_call: Callable[[dict[str, Any]], None] | None = None
+) -> dict[str, Any]:
+    """Rebuild a completion from deltas; each tool call goes to ``on_tool_call`` once its arguments parse."""
+    content: list[str] = []
+    reasoning: list[str] = []
+    calls: dict[int, dict[str, Any]] = {}
+    announced: set[int] = set()
+    finish_reason = usage = None
+
+    def announce(index: int) -> None:
+        if on_tool_call is not None and index not in announced:
+            announced.add(index)
+            on_tool_call({"id": calls[index]["id"], **calls[index]["function"]})
+    for chunk in chunks:
+        usage = response_attr(chunk, "usage") or usage
+        for choice in response_attr(chunk, "choices") or []:
+            finish_reason = response_attr(choice, "finish_reason") or finish_reason
+            delta = response_attr(choice, "delta") or {}
+            content.append(response_attr(delta, "content") or "")
+            reasoning.append(response_attr(delta, "reasoning_content") or "")
+            for fragment in response_attr(delta, "tool_calls") or []:
+                index = response_attr(fragment, "index") or 0
+                call = calls.setdefault(
+                    index, {"id": None, "type": "function", "function": {"name": "", "arguments": ""}}
+                )
+                call["id"] = response_attr(fragment, "id") or call["id"]
+                function = response_attr(fragment, "function") or {}
+                call["function"]["name"] += response_attr(function, "name") or ""
+                call["function"]["arguments"] += response_attr(function, "arguments") or ""
+                arguments = call["function"]["arguments"].rstrip()
+                if arguments.endswith("}") and parse_tool_input(arguments)[1] is None:
+                    announce(index)
+    for index in sorted(calls):
+        announce(index)
+    message: dict[str, Any] = {"role": "assistant", "content": "".join(content)}
+    if any(reasoning):
+        message["reasoning_content"] = "".join(reasoning)
+    if calls:
+        message["tool_calls"] = [calls[index] for index in sorted(calls)]
+    return {"choices": [{"message": message, "finish_reason": finish_reason}], "usage": usage}
+
+
 def extract_response_meta(response: Any) -> dict[str, Any]:
     """Return the response facts used for recovery and completion decisions."""
 
@@ -413,6 +457,10 @@ class HelloAgentsLLM:
             timeout=self.timeout
         )
 
+    def transport_stats(self) -> dict[str, Any]:
+        """Connection-pool counters for trace diagnostics; empty for custom clients."""
+        return getattr(self._client, "transport_stats", dict)()
+
     @staticmethod
     def _compact_request_kwargs(kwargs: dict) -> dict:
         """Drop None-valued fields before provider request dispatch."""
@@ -523,10 +571,12 @@ class HelloAgentsLLM:
         project_response: Callable[[Any], Any] | None = None,
         **overrides: Any,
     ) -> Any:
-        """Make one non-streaming request with the configured retry policy."""
+        """Make one request with the configured retry policy."""
+        request = None
         for attempt in range(self.max_retries + 1):
             try:
-                request = self._build_request(messages, **overrides)
+                # Built once so retries resend the same message objects (and encoded body).
+                request = request or self._build_request(messages, **overrides)
                 response = self._client.chat.completions.create(**request)
                 return project_response(response) if project_response else response
             except Exception as error:
@@ -598,6 +648,17 @@ class HelloAgentsLLM:
         """
         return self._invoke_with_retries(messages, **kwargs)
 
+    def invoke_raw_stream(
+        self, messages: list[dict[str, str]], on_tool_call: Callable[[dict[str, Any]], None] | None = None,
+        **kwargs,
+    ) -> dict[str, Any]:
+        """
+        流式调用LLM，重组为与 invoke_raw 同形的响应。
+        每个 tool call 的 arguments 完整时即回调 on_tool_call，供调用方提前执行只读工具。
+        """
+        assemble = partial(assemble_stream_response, on_tool_call=on_tool_call)
+        return self._invoke_with_retries(messages, assemble, stream=True, **kwargs)
+
     def stream_invoke(self, messages: list[dict[str, str]], **kwargs) -> Iterator[str]:
         """Alias for think()."""
         temperature = kwargs.get('temperature')
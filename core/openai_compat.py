@@ -3,9 +3,13 @@
 from __future__ import annotations
 
 import json
+import threading
+import time
+from http.client import HTTPConnection, HTTPException, HTTPSConnection
 from typing import Any
 from urllib.error import HTTPError, URLError
-from urllib.request import Request, urlopen
+from urllib.parse import urlsplit
+from urllib.request import Request, getproxies, urlopen
 
 
 class ResponseObject:
@@ -45,6 +49,115 @@ class _Chat:
         self.completions = _Completions(client)
 
 
+class _ConnectionPool:
+    """Bounded HTTP/1.1 keep-alive connections for one base URL."""
+
+    def __init__(self, base_url: str, max_size: int = 4, idle_timeout: float = 60.0):
+        parts = urlsplit(base_url)
+        self.scheme, self.netloc, self.path = parts.scheme, parts.netloc, parts.path
+        self.max_size, self.idle_timeout, self._lock = max_size, idle_timeout, threading.Lock()
+        self.stats = {"connections_opened": 0, "pool_hits": 0, "connect_ms": 0.0}
+        self._idle: list[tuple[float, HTTPConnection]] = []
+
+    def acquire(self, timeout: int) -> tuple[HTTPConnection, bool]:
+        """Return ``(connection, reused)``, evicting connections idle too long."""
+        now = time.monotonic()
+        with self._lock:
+            # Connections are released in time order, so the stale ones lead the idle list.
+            while self._idle and now - self._idle[0][0] > self.idle_timeout:
+                self._idle.pop(0)[1].close()
+            if self._idle:
+                self.stats["pool_hits"] += 1
+                conn = self._idle.pop()[1]
+                if conn.sock is not None:
+                    conn.sock.settimeout(timeout)
+                return conn, True
+        conn = (HTTPSConnection if self.scheme == "https" else HTTPConnection)(self.netloc, timeout=timeout)
+        started = time.perf_counter()
+        conn.connect()
+        with self._lock:
+            self.stats["connections_opened"] += 1
+            self.stats["connect_ms"] += (time.perf_counter() - started) * 1000
+        return conn, False
+
+    def release(self, conn: HTTPConnection) -> None:
+        with self._lock:
+            if len(self._idle) < self.max_size:
+                self._idle.append((time.monotonic(), conn))
+                return
+        conn.close()
+
+
+_POOLS: dict[str, _ConnectionPool] = {}
+_POOLS_LOCK = threading.Lock()
+
+
+class _PooledResponse:
+    """Return the connection to its pool once the response body is consumed."""
+
+    def __init__(self, response: Any, conn: HTTPConnection, pool: _ConnectionPool):
+        self._response, self._conn, self._pool = response, conn, pool
+
+    def read(self) -> bytes:
+        return self._response.read()
+
+    def __iter__(self):
+        return iter(self._response)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, *_args):
+        # Drain only a cleanly finished body; an abandoned stream closes instead of waiting for the server.
+        if exc_type is None:
+            try:
+                self._response.read()
+            except (OSError, HTTPException):
+                exc_type = OSError
+        if exc_type is None and not self._response.will_close:
+            self._pool.release(self._conn)
+        else:
+            self._conn.close()
+        return False
+
+
+def _content_key(value: Any) -> Any:
+    """A hashable form of JSON data, equal only for equal content; strings keep their cached hash."""
+    if isinstance(value, dict):
+        return dict, tuple((key, _content_key(item)) for key, item in value.items())
+    if isinstance(value, (list, tuple)):
+        return list, tuple(map(_content_key, value))
+    return value if isinstance(value, str) else (type(value), value)
+
+
+class _BodyEncoder:
+    """Reuse the last request's per-message JSON, keyed by content, so appending re-encodes only the tail."""
+
+    def __init__(self):
+        self._fragments: dict[Any, bytes] = {}
+        self._last: tuple[list[Any], bytes, bytes] | None = None
+        self.stats = {"encode_ms": 0.0, "encoded_messages": 0, "reused_messages": 0}
+
+    def encode(self, payload: dict[str, Any]) -> bytes:
+        started, messages = time.perf_counter(), payload.get("messages") or []
+        rest = json.dumps({key: value for key, value in payload.items() if key != "messages"}).encode("utf-8")
+        keys = [_content_key(message) for message in messages]
+        if self._last is not None and self._last[:2] == (keys, rest):
+            body = self._last[2]
+        else:
+            fragments: dict[Any, bytes] = {}
+            for key, message in zip(keys, messages):
+                fragment = self._fragments.get(key) or fragments.get(key)
+                self.stats["reused_messages" if fragment else "encoded_messages"] += 1
+                fragments[key] = fragment or json.dumps(message).encode("utf-8")
+            self._fragments = fragments
+            encoded = b", ".join(fragments[key] for key in keys)
+            body = b'{"messages": [' + encoded + b"]" + (b", " + rest[1:] if rest != b"{}" else b"}")
+            self._last = (keys, rest, body)
+        self.stats["encode_ms"] += (time.perf_counter() - started) * 1000
+        return body
+
+
 class OpenAICompatibleClient:
     """Subset of the official SDK used by ``HelloAgentsLLM`` without extra deps."""
 
@@ -53,17 +166,21 @@ class OpenAICompatibleClient:
         self.base_url = base_url.rstrip("/")
         self.timeout = timeout
         self.chat = _Chat(self)
+        with _POOLS_LOCK:
+            self._pool = _POOLS.setdefault(self.base_url, _ConnectionPool(self.base_url))
+        self._encoder = _BodyEncoder()
+
+    def transport_stats(self) -> dict[str, Any]:
+        """Shared-pool connection counters plus this client's body-encoding counters."""
+        return {**self._pool.stats, **self._encoder.stats}
 
     def _request(self, payload: dict[str, Any]):
-        request = Request(
-            f"{self.base_url}/chat/completions",
-            data=json.dumps(payload).encode("utf-8"),
-            headers={
-                "Authorization": f"Bearer {self.api_key}",
-                "Content-Type": "application/json",
-            },
-            method="POST",
-        )
+        body = self._encoder.encode(payload)
+        headers = {"Authorization": f"Bearer {self.api_key}", "Content-Type": "application/json"}
+        if self._pool.scheme not in getproxies():
+            return self._pooled_request(body, headers)
+        # Proxied traffic keeps urllib's proxy handling instead of direct pooling.
+        request = Request(f"{self.base_url}/chat/completions", data=body, headers=headers, method="POST")
         try:
             return urlopen(request, timeout=self.timeout)
         except HTTPError as exc:
@@ -72,6 +189,28 @@ class OpenAICompatibleClient:
         except URLError as exc:
             raise RuntimeError(f"OpenAI-compatible API request failed: {exc.reason}") from exc
 
+    def _pooled_request(self, body: bytes, headers: dict[str, str]) -> _PooledResponse:
+        path = f"{self._pool.path}/chat/completions"
+        while True:
+            try:
+                conn, reused = self._pool.acquire(self.timeout)
+            except (OSError, HTTPException) as exc:
+                raise RuntimeError(f"OpenAI-compatible API request failed: {exc}") from exc
+            try:
+                conn.request("POST", path, body=body, headers=headers)
+                response = conn.getresponse()
+                break
+            except (OSError, HTTPException) as exc:
+                conn.close()
+                # Retry only a reused socket reset before replying; a timeout may follow a processed request.
+                if not reused or not isinstance(exc, (ConnectionResetError, BrokenPipeError)):
+                    raise RuntimeError(f"OpenAI-compatible API request failed: {exc}") from exc
+        if response.status >= 400:
+            detail = response.read().decode("utf-8", errors="replace")
+            conn.close()
+            raise RuntimeError(f"OpenAI-compatible API returned HTTP {response.status}: {detail}")
+        return _PooledResponse(response, conn, self._pool)
+
     def _create_completion(self, payload: dict[str, Any]) -> Any:
         if payload.get("stream"):
             return self._stream(payload)
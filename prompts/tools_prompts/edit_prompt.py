@@ -6,6 +6,7 @@ Use exactly one input mode:
 
 - To create a new file, send `path` and `create_content`. Parent directories are created as needed. The same mode fully replaces an existing file after Read supplies its snapshot lock.
 - To change an existing file, Read it first, then send `path` and a non-empty `edits` array. Each item has a unique `old_string` and its `new_string`. Every anchor is matched against the original content; overlapping anchors are rejected. The framework injects the Read snapshot lock.
+- To change several existing files together (for example a cross-file rename), add `batch`: an array of further `{path, edits}` objects, each Read first. Every file is checked and edited in memory before any is written; a conflict or failed anchor in any file leaves all of them unchanged.
 
 Safety guarantees
 
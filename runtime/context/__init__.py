@@ -1,6 +1,6 @@
 """Context engineering subsystem."""
 
-from runtime.context.budget import CompactDecision, ContextBudgetPolicy
+from runtime.context.budget import CharRatioEstimator, CompactDecision, ContextBudgetPolicy, TokenEstimator
 from runtime.context.compact import ContextCompactor
 from runtime.context.compact_store import CompactCheckpoint, CompactStore
 from runtime.context.engine import ContextEngine
@@ -11,6 +11,7 @@ from runtime.context.rounds import HistoryRound, RoundSegmenter
 from runtime.session_memory import SessionMemory
 
 __all__ = [
+    "CharRatioEstimator",
     "CompactCheckpoint",
     "CompactDecision",
     "CompactStore",
@@ -24,4 +25,5 @@ __all__ = [
     "ProjectionResult",
     "RoundSegmenter",
     "SessionMemory",
+    "TokenEstimator",
 ]
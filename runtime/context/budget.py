@@ -4,8 +4,10 @@ from __future__ import annotations
 
 import json
 from dataclasses import dataclass
+from typing import Protocol
 
 from core.config import Config
+from runtime.context.projection import ProjectionResult
 from runtime.history import Message
 
 
@@ -18,25 +20,59 @@ class CompactDecision:
     message_count: int
 
 
+class TokenEstimator(Protocol):
+    """Counts tokens for one text; a local BPE table can replace the heuristic."""
+
+    def count(self, text: str) -> int: ...
+
+
+class CharRatioEstimator:
+    """About three characters per token, floored per message, so a total may sit below ``chars // 3``."""
+
+    def count(self, text: str) -> int:
+        return len(text) // 3
+
+
 class ContextBudgetPolicy:
     """Decides when the active model context needs compaction."""
 
-    def __init__(self, config: Config | None = None):
+    def __init__(self, config: Config | None = None, estimator: TokenEstimator | None = None):
         self.config = config or Config.from_env()
+        self.estimator = estimator or CharRatioEstimator()
+        # Prefix sums over the append-only source history; each message is costed once.
+        self._prefix_tokens: list[int] = [0]
+        self._costed_tail: Message | None = None
+
+    def message_tokens(self, msg: Message) -> int:
+        text, metadata = str(msg.content or ""), msg.metadata or {}
+        if msg.role == "assistant" and metadata.get("tool_calls"):
+            try:
+                text += json.dumps(metadata["tool_calls"], ensure_ascii=False)
+            except Exception:
+                text += str(metadata["tool_calls"])
+        if msg.role == "tool" and metadata.get("tool_name"):
+            text += str(metadata["tool_name"])
+        return self.estimator.count(text)
 
     def estimate_tokens(self, messages: list[Message], pending_input: str = "") -> int:
-        total_chars = len(pending_input or "")
-        for msg in messages or []:
-            total_chars += len(str(msg.content or ""))
-            metadata = msg.metadata or {}
-            if msg.role == "assistant" and metadata.get("tool_calls"):
-                try:
-                    total_chars += len(json.dumps(metadata["tool_calls"], ensure_ascii=False))
-                except Exception:
-                    total_chars += len(str(metadata["tool_calls"]))
-            if msg.role == "tool" and metadata.get("tool_name"):
-                total_chars += len(str(metadata["tool_name"]))
-        return total_chars // 3
+        pending = self.estimator.count(pending_input or "")
+        return pending + sum(self.message_tokens(msg) for msg in messages or [])
+
+    def estimate_projection_tokens(
+        self, source_messages: list[Message], projection: ProjectionResult, pending_input: str = ""
+    ) -> int:
+        """Same total as ``estimate_tokens(projection.messages)``, in O(new messages)."""
+        known = len(self._prefix_tokens) - 1
+        if known > len(source_messages) or (known and source_messages[known - 1] is not self._costed_tail):
+            self._prefix_tokens, known = [0], 0  # History was replaced (reset or resume).
+        for msg in source_messages[known:]:
+            self._prefix_tokens.append(self._prefix_tokens[-1] + self.message_tokens(msg))
+        self._costed_tail = source_messages[-1] if source_messages else None
+        retained = projection.messages[1:] if projection.compact_checkpoint_id else projection.messages
+        summary_tokens = self.message_tokens(projection.messages[0]) if projection.compact_checkpoint_id else 0
+        retain_start = len(source_messages) - len(retained)
+        fixed = self.estimator.count(pending_input or "") + summary_tokens
+        return fixed + self._prefix_tokens[-1] - self._prefix_tokens[retain_start]
 
     def should_compact(
         self,
@@ -44,10 +80,11 @@ class ContextBudgetPolicy:
         messages: list[Message],
         pending_input: str = "",
         last_usage_tokens: int = 0,
+        estimated_tokens: int | None = None,
     ) -> CompactDecision:
         message_count = len(messages or [])
         threshold = int(self.config.context_window * self.config.compression_threshold)
-        estimated_from_messages = self.estimate_tokens(messages, pending_input)
+        estimated_from_messages = estimated_tokens or self.estimate_tokens(messages, pending_input)
         estimated_from_usage = int(last_usage_tokens or 0) + len(pending_input or "") // 3
         estimated = max(estimated_from_messages, estimated_from_usage)
 
@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+import hashlib
+import json
 from typing import Any
 
 from core.config import Config
@@ -14,6 +16,26 @@ from runtime.context.projection import ProjectionBuilder
 from runtime.session_memory import SessionMemory, render_session_memory
 
 
+class _PrefixHash:
+    """Running SHA-256 states, one per encoded message, so an append-only prefix hashes only its new tail."""
+
+    def __init__(self) -> None:
+        self._messages: list[dict[str, Any]] = []
+        self._states: list[tuple[Any, int]] = [(hashlib.sha256(), 0)]
+
+    def update(self, messages: list[dict[str, Any]]) -> tuple[int, str]:
+        keep = min(len(self._messages), len(messages))
+        keep = keep if self._messages[:keep] == messages[:keep] else 0
+        del self._messages[keep:], self._states[keep + 1 :]
+        for message in messages[keep:]:
+            fragment, digest = json.dumps(message), self._states[-1][0].copy()
+            digest.update(fragment.encode("utf-8"))
+            self._messages.append(message)
+            self._states.append((digest, self._states[-1][1] + len(fragment)))
+        digest, chars = self._states[-1]
+        return chars, digest.hexdigest()[:16]
+
+
 class ContextEngine:
     """Builds the exact model-facing context for a loop iteration."""
 
@@ -43,6 +65,7 @@ class ContextEngine:
         self.last_usage_tokens = 0
         self.total_usage_tokens = 0
         self.session_memory: SessionMemory | None = None
+        self._prefix_hash = _PrefixHash()
 
     def record_usage(self, total_tokens: int | None) -> None:
         if total_tokens is None:
@@ -66,10 +89,12 @@ class ContextEngine:
         if checkpoint and checkpoint.source_message_count == len(source_messages):
             return False
         projection = self.projection_builder.project(source_messages)
+        estimated = self.budget_policy.estimate_projection_tokens(source_messages, projection, pending_input)
         decision = self.budget_policy.should_compact(
             messages=projection.messages,
             pending_input=pending_input,
             last_usage_tokens=self.last_usage_tokens,
+            estimated_tokens=estimated,
         )
         return decision.should_compact
 
@@ -91,10 +116,12 @@ class ContextEngine:
             }
 
         projection = self.projection_builder.project(source_messages)
+        estimated = self.budget_policy.estimate_projection_tokens(source_messages, projection, pending_input)
         decision = self.budget_policy.should_compact(
             messages=projection.messages,
             pending_input=pending_input,
             last_usage_tokens=self.last_usage_tokens,
+            estimated_tokens=estimated,
         )
         if trace_logger:
             trace_logger.log_event(
@@ -135,7 +162,9 @@ class ContextEngine:
     ) -> ModelView:
         source_messages = history_manager.get_messages()
         projection = self.projection_builder.project(source_messages)
-        history_messages = self.normalizer.normalize(projection.messages)
+        history_messages = self.normalizer.normalize_incremental(
+            projection.messages, projection.compact_checkpoint_id
+        )
         system_messages = self.context_builder.get_system_messages()
         dynamic_messages: list[dict[str, Any]] = []
         session_memory_chars = 0
@@ -149,6 +178,11 @@ class ContextEngine:
                 session_memory_message_count = 1
                 dynamic_sources.append("session_memory")
         messages = list(system_messages) + dynamic_messages + list(history_messages)
+        stable_count, prefix_chars, prefix_hash = 0, 0, ""
+        if getattr(self.config, "stable_prefix_context", False):
+            messages = list(system_messages) + list(history_messages) + dynamic_messages
+            stable_count = len(system_messages) + len(history_messages)
+            prefix_chars, prefix_hash = self._prefix_hash.update(messages[:stable_count])
 
         estimated_chars = len(pending_input or "")
         for message in messages:
@@ -167,6 +201,9 @@ class ContextEngine:
             session_memory_message_count=session_memory_message_count,
             session_memory_chars=session_memory_chars,
             dynamic_context_sources=tuple(dynamic_sources),
+            stable_prefix_message_count=stable_count,
+            stable_prefix_chars=prefix_chars,
+            stable_prefix_hash=prefix_hash,
         )
 
         if trace_logger:
@@ -22,6 +22,9 @@ class ModelView:
     session_memory_message_count: int = 0
     session_memory_chars: int = 0
     dynamic_context_sources: tuple[str, ...] = field(default_factory=tuple)
+    stable_prefix_message_count: int = 0
+    stable_prefix_chars: int = 0
+    stable_prefix_hash: str = ""
 
     @property
     def message_count(self) -> int:
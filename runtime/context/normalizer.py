@@ -4,6 +4,7 @@ from __future__ import annotations
 
 import json
 import logging
+from collections.abc import Sequence
 from typing import Any
 
 from runtime.history import Message
@@ -14,12 +15,29 @@ logger = logging.getLogger(__name__)
 class MessageNormalizer:
     """Serializes runtime messages into OpenAI-compatible dictionaries."""
 
-    def normalize(self, messages: list[Message]) -> list[dict[str, Any]]:
+    def __init__(self) -> None:
+        # (checkpoint_id, normalized message count, last normalized message, output)
+        self._prefix: tuple[str | None, int, Message | None, list[dict[str, Any]]] | None = None
+
+    def normalize(self, messages: Sequence[Message]) -> list[dict[str, Any]]:
         normalized: list[dict[str, Any]] = []
         for msg in messages or []:
             normalized.extend(self._normalize_one(msg))
         return normalized
 
+    def normalize_incremental(
+        self, messages: Sequence[Message], checkpoint_id: str | None = None
+    ) -> list[dict[str, Any]]:
+        """Normalize an append-only projection, reusing the output for its known prefix."""
+        messages, start, normalized = messages or [], 0, []
+        key, count, last, output = self._prefix or (None, 0, None, [])
+        if key == checkpoint_id and 0 < count <= len(messages) and messages[count - 1] is last:
+            start, normalized = count, output
+        for msg in messages[start:]:
+            normalized.extend(self._normalize_one(msg))
+        self._prefix = (checkpoint_id, len(messages), messages[-1] if messages else None, normalized)
+        return list(normalized)
+
     def _normalize_one(self, msg: Message) -> list[dict[str, Any]]:
         if msg.role == "user":
             return [{"role": "user", "content": msg.content}]
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+from collections.abc import Sequence
 from dataclasses import dataclass, field
 
 from runtime.context.compact_store import CompactStore
@@ -10,7 +11,7 @@ from runtime.history import Message
 
 @dataclass(frozen=True)
 class ProjectionResult:
-    messages: list[Message]
+    messages: Sequence[Message]
     source_message_count: int
     projection_mode: str = "full_history"
     warnings: tuple[str, ...] = field(default_factory=tuple)
@@ -23,8 +24,8 @@ class ProjectionBuilder:
     def __init__(self, compact_store: CompactStore | None = None):
         self.compact_store = compact_store
 
-    def project(self, source_messages: list[Message]) -> ProjectionResult:
-        source = list(source_messages or [])
+    def project(self, source_messages: Sequence[Message]) -> ProjectionResult:
+        source = source_messages or []
         checkpoint = self.compact_store.active_checkpoint if self.compact_store else None
         if not checkpoint:
             return ProjectionResult(
@@ -45,7 +46,7 @@ class ProjectionBuilder:
             },
         )
         return ProjectionResult(
-            messages=[summary] + source[retain_start_idx:],
+            messages=[summary, *source[retain_start_idx:]],
             source_message_count=len(source),
             projection_mode="compact_checkpoint",
             warnings=(),
@@ -1,30 +1,26 @@
 """Runtime message and history services."""
 
+from collections.abc import Sequence
+from dataclasses import dataclass, field
 from datetime import datetime
+from itertools import islice
 from typing import Any, Dict, List, Literal, Optional
 
-from pydantic import BaseModel
+from pydantic import BaseModel, TypeAdapter
 
 from core.config import Config
 
 MessageRole = Literal["user", "assistant", "summary", "tool"]
 
-class Message(BaseModel):
-    """消息类"""
-    
+@dataclass(slots=True)
+class Message:
+    """消息类（轻量 slots 记录；校验只在 load_messages 导入边界进行）"""
+
     content: str
     role: MessageRole
-    timestamp: datetime = None
-    metadata: Optional[Dict[str, Any]] = None
-    
-    def __init__(self, content: str, role: MessageRole, **kwargs):
-        super().__init__(
-            content=content,
-            role=role,
-            timestamp=kwargs.get('timestamp', datetime.now()),
-            metadata=kwargs.get('metadata', {})
-        )
-    
+    timestamp: Optional[datetime] = field(default_factory=datetime.now)
+    metadata: Optional[Dict[str, Any]] = field(default_factory=dict)
+
     def to_dict(self) -> Dict[str, Any]:
         """转换为字典格式（OpenAI API格式）"""
         return {
@@ -36,6 +32,46 @@ class Message(BaseModel):
         return f"[{self.role}] {self.content}"
 
 
+class _MessageRecord(BaseModel):
+    """持久化消息的导入校验模型。"""
+
+    content: str = ""
+    role: MessageRole
+    metadata: Optional[Dict[str, Any]] = None
+
+
+_MESSAGE_RECORDS = TypeAdapter(List[_MessageRecord])
+
+
+class HistoryView(Sequence):
+    """只读、零拷贝的历史窗口：以长度围栏固定在创建时刻，切片仍是视图。"""
+
+    __slots__ = ("_items", "_start", "_stop")
+
+    def __init__(self, items: List[Message], start: int = 0, stop: Optional[int] = None):
+        self._items, self._start, self._stop = items, start, len(items) if stop is None else stop
+
+    def __len__(self) -> int:
+        return self._stop - self._start
+
+    def __getitem__(self, index):
+        picked = range(self._start, self._stop)[index]
+        if isinstance(picked, int):
+            return self._items[picked]
+        if picked.step != 1:
+            return [self._items[position] for position in picked]
+        return HistoryView(self._items, picked.start, max(picked.start, picked.stop))
+
+    def __iter__(self):
+        return islice(self._items, self._start, self._stop)
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, Sequence) and len(self) == len(other) and list(self) == list(other)
+
+    def __repr__(self) -> str:
+        return f"HistoryView({list(self)!r})"
+
+
 class HistoryManager:
     """
     历史记录管理器
@@ -160,9 +196,9 @@ class HistoryManager:
         self._messages.append(msg)
         return msg
     
-    def get_messages(self) -> List[Message]:
-        """获取所有历史消息的副本"""
-        return self._messages.copy()
+    def get_messages(self) -> HistoryView:
+        """获取当前历史的只读视图（不复制；之后的追加不会出现在该视图中）"""
+        return HistoryView(self._messages)
 
     def serialize_messages(self) -> List[Dict[str, Any]]:
         """
@@ -181,25 +217,19 @@ class HistoryManager:
         """
         从序列化结构恢复历史消息。
         """
-        self._messages = []
-        for item in items or []:
-            role = item.get("role")
-            if role not in {"user", "assistant", "tool", "summary"}:
-                continue
-            msg = Message(
-                content=item.get("content", ""),
-                role=role,
-                metadata=item.get("metadata", {}) or {},
-            )
-            self._messages.append(msg)
+        known = [item for item in items or [] if item.get("role") in {"user", "assistant", "tool", "summary"}]
+        self._messages = [
+            Message(content=record.content, role=record.role, metadata=record.metadata or {})
+            for record in _MESSAGE_RECORDS.validate_python(known)
+        ]
     
     def get_message_count(self) -> int:
         """获取消息数量"""
         return len(self._messages)
     
     def clear(self):
-        """清空历史记录"""
-        self._messages.clear()
+        """清空历史记录（换新列表，已发出的视图保持不变）"""
+        self._messages = []
     
     def get_rounds_count(self) -> int:
         """获取当前轮次数"""
@@ -2,7 +2,7 @@ import os
 import logging
 import sys
 from pathlib import Path
-from typing import Any, List, Optional
+from typing import Any, List, Optional, Sequence
 
 from core.llm import HelloAgentsLLM
 from core.config import Config
@@ -28,6 +28,7 @@ from tools.executor import ToolExecutor
 from tools.orchestrator import ToolOrchestrator
 from tools.context import ToolExecutionContext
 from tools.permissions import PermissionContext, RiskClassifier
+from tools.workspace import WORKSPACE_DURABILITY
 from extensions.tracing import NullTraceLogger, create_trace_logger
 from utils import setup_logger
 from runtime.factory import (
@@ -75,6 +76,7 @@ class CodeAgent:
         self.llm = llm
         self.system_prompt = system_prompt
         self.config = config or Config.from_env()
+        WORKSPACE_DURABILITY.set_mode(self.config.workspace_durability)
         self.project_root = project_root
         self.package_resource_root = package_resource_root
         self.tool_registry = tool_registry
@@ -206,6 +208,7 @@ class CodeAgent:
 
     def close(self):
         """关闭 Agent 并写入 trace 总结"""
+        self.tool_orchestrator.close()
         if self.trace_logger:
             self.trace_logger.finalize()
             self.trace_logger = None
@@ -310,6 +313,7 @@ class CodeAgent:
     def cancel_active_turn(self) -> dict[str, Any]:
         """Record an interrupted terminal fact for the currently incomplete turn."""
 
+        WORKSPACE_DURABILITY.flush()
         active_run_id = self._active_transcript_run_id
         if active_run_id is None and self._turn_cancelled:
             return {"cancelled": False, "run_id": None}
@@ -433,6 +437,6 @@ class CodeAgent:
         self.history_manager.clear()
         self.context_engine.reset()
     
-    def get_history(self) -> List[Message]:
-        """Return managed runtime history."""
+    def get_history(self) -> Sequence[Message]:
+        """Return a read-only view of managed runtime history."""
         return self.history_manager.get_messages()
@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import uuid
+from functools import partial
 from typing import Any
 
 from core.llm import (
@@ -30,6 +31,7 @@ from runtime.events import (
 from runtime.input_preprocess import preprocess_input
 from runtime.model_errors import ModelErrorKind, classify_model_error
 from runtime.state import LoopState, TerminalReason, TransitionReason
+from tools.workspace import WORKSPACE_DURABILITY
 
 
 class RuntimeRunner:
@@ -103,6 +105,7 @@ class RuntimeRunner:
         step: int = 0,
         **details: Any,
     ) -> None:
+        WORKSPACE_DURABILITY.flush()
         self._emit("terminal", {"reason": reason.value, "details": details}, step=step)
 
     def _get_transcript_run_id(self) -> str:
@@ -352,7 +355,9 @@ class RuntimeRunner:
 
             while True:
                 try:
-                    raw_response = host.llm.invoke_raw(messages, tools=tools_schema, tool_choice=tool_choice)
+                    raw_response = self._invoke_model(
+                        messages, tools_schema, tool_choice, step=step, trace_logger=trace_logger
+                    )
                 except Exception as exc:
                     classification = classify_model_error(error=exc)
                     retry_count = state.model_recovery_counts.get(classification.kind.value, 0)
@@ -418,16 +423,7 @@ class RuntimeRunner:
                             messages = model_view.messages
                             base_messages = messages
                             state = state.update(messages=messages)
-                            self._emit(
-                                "context_build",
-                                {
-                                    "message_count": len(messages),
-                                    "history_count": model_view.history_message_count,
-                                    "source_message_count": model_view.source_message_count,
-                                    "projection_mode": model_view.projection_mode,
-                                },
-                                step=step,
-                            )
+                            self._emit("context_build", self._context_build_payload(model_view), step=step)
                             continue
 
                         self._trace_model_recovery_failed(
@@ -527,17 +523,11 @@ class RuntimeRunner:
                 response_meta = extract_response_meta(raw_response)
                 tool_calls = extract_tool_calls(raw_response)
                 raw_dump = serialize_response(raw_response)
-                self._emit(
-                    "model_output",
-                    {
-                        "raw": response_text,
-                        "usage": usage,
-                        "meta": response_meta,
-                        "raw_response": raw_dump,
-                        "tool_calls": tool_calls,
-                    },
-                    step=step,
-                )
+                model_output = {"raw": response_text, "usage": usage, "meta": response_meta}
+                model_output.update(raw_response=raw_dump, tool_calls=tool_calls)
+                if hasattr(host.llm, "transport_stats"):
+                    model_output["transport"] = host.llm.transport_stats()
+                self._emit("model_output", model_output, step=step)
 
                 if host.console_verbose and reasoning_content:
                     display_reasoning = reasoning_content
@@ -918,6 +908,28 @@ class RuntimeRunner:
         )
         return "抱歉，我无法在限定步数内完成这个任务。"
 
+    @staticmethod
+    def _context_build_payload(model_view: Any) -> dict[str, Any]:
+        return {
+            "message_count": len(model_view.messages),
+            "history_count": model_view.history_message_count,
+            "source_message_count": model_view.source_message_count,
+            "projection_mode": model_view.projection_mode,
+            "stable_prefix_message_count": getattr(model_view, "stable_prefix_message_count", 0),
+            "stable_prefix_chars": getattr(model_view, "stable_prefix_chars", 0),
+            "stable_prefix_hash": getattr(model_view, "stable_prefix_hash", ""),
+        }
+
+    def _invoke_model(self, messages, tools_schema, tool_choice, *, step: int, trace_logger) -> Any:
+        """Call the model; in streaming dispatch mode, start safe tools as calls complete."""
+        host, orchestrator = self.host, self.host.tool_orchestrator
+        streaming = getattr(host.config, "stream_tool_dispatch", False)
+        if not (streaming and hasattr(host.llm, "invoke_raw_stream") and hasattr(orchestrator, "prefetch")):
+            return host.llm.invoke_raw(messages, tools=tools_schema, tool_choice=tool_choice)
+        orchestrator.discard_prefetched()
+        prefetch = partial(orchestrator.prefetch, step=step, trace_logger=trace_logger)
+        return host.llm.invoke_raw_stream(messages, prefetch, tools=tools_schema, tool_choice=tool_choice)
+
     def _prepare_step_context(
         self,
         *,
@@ -995,14 +1007,5 @@ class RuntimeRunner:
         )
         messages = model_view.messages
         state = state.update(step=step, messages=messages)
-        self._emit(
-            "context_build",
-            {
-                "message_count": len(messages),
-                "history_count": model_view.history_message_count,
-                "source_message_count": model_view.source_message_count,
-                "projection_mode": model_view.projection_mode,
-            },
-            step=step,
-        )
+        self._emit("context_build", self._context_build_payload(model_view), step=step)
         return state, tools_schema, messages
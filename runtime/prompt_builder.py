@@ -28,8 +28,12 @@ import runpy
 from typing import List, Optional, Dict, Any
 
 
-def _hash_text(text: str) -> str:
-    return hashlib.sha256((text or "").encode("utf-8")).hexdigest()
+def _file_stamp(path: Path) -> Optional[tuple]:
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
 
 
 def _hash_json(data: Any) -> str:
@@ -73,9 +77,10 @@ class ContextBuilder:
     skills_prompt: Optional[str] = None
     tool_prompt_allowlist: Optional[frozenset[str]] = None
     _cached_code_law: str = field(default="", init=False)
-    _cached_code_law_mtime: Optional[float] = field(default=None, init=False)
-    _cached_code_law_hash: str = field(default="", init=False)
+    _cached_code_law_stamp: Optional[tuple] = field(default=None, init=False)
     _cached_assembly: Optional[PromptAssembly] = field(default=None, init=False)
+    _cached_assembly_key: Optional[tuple] = field(default=None, init=False)
+    _prompt_file_cache: Dict[str, tuple] = field(default_factory=dict, init=False)
     _mcp_tools_prompt: str = field(default="", init=False)
     _skills_prompt: str = field(default="", init=False)
     _runtime_system_blocks: List[str] = field(default_factory=list, init=False)
@@ -110,14 +115,19 @@ class ContextBuilder:
         return [dict(m) for m in assembly.all_system_messages]
 
     def get_prompt_assembly(self) -> PromptAssembly:
-        constitution_text = self._load_system_prompt().replace("{tools}", "").strip()
-        code_law = self._load_code_law()
-
         if self._mcp_tools_prompt == "" and self.mcp_tools_prompt:
             self._mcp_tools_prompt = self.mcp_tools_prompt
         if self._skills_prompt == "" and self.skills_prompt:
             self._skills_prompt = self.skills_prompt
 
+        # 只 stat 源文件：未变化时直接复用已装配结果，不再 runpy / 重新 hash
+        source_key = self._prompt_source_key()
+        if self._cached_assembly is not None and source_key == self._cached_assembly_key:
+            return self._cached_assembly
+
+        constitution_text = self._load_system_prompt().replace("{tools}", "").strip()
+        code_law = self._load_code_law()
+
         tool_contracts_text = self._load_tool_prompts().strip()
         runtime_signal_messages = self._build_runtime_signal_messages()
         runtime_signals_fingerprint = _hash_json(runtime_signal_messages)
@@ -160,6 +170,7 @@ class ContextBuilder:
             and self._cached_assembly.system_fingerprint == system_fingerprint
             and self._cached_assembly.runtime_signals_fingerprint == runtime_signals_fingerprint
         ):
+            self._cached_assembly_key = source_key
             return self._cached_assembly
 
         stable_messages = constitution_messages + tool_contract_messages + project_rule_messages
@@ -176,7 +187,7 @@ class ContextBuilder:
             runtime_signals_fingerprint=runtime_signals_fingerprint,
             system_fingerprint=system_fingerprint,
         )
-        self._cached_assembly = assembly
+        self._cached_assembly, self._cached_assembly_key = assembly, source_key
         return assembly
 
     def _get_system_messages(self) -> List[Dict[str, Any]]:
@@ -214,7 +225,7 @@ class ContextBuilder:
         prompt_path = self._resource_root() / "prompts" / "agents_prompts" / "L1_system_prompt.py"
         if not prompt_path.exists():
             return ""
-        data = runpy.run_path(str(prompt_path))
+        data = self._run_prompt_file(prompt_path)
         prompt = data.get("system_prompt", "")
         return prompt if isinstance(prompt, str) else ""
 
@@ -232,7 +243,7 @@ class ContextBuilder:
             for path in sorted(prompts_dir.glob("*.py")):
                 if path.name.startswith("__"):
                     continue
-                data = runpy.run_path(str(path))
+                data = self._run_prompt_file(path)
                 for name, value in data.items():
                     if name.endswith("_prompt") and isinstance(value, str):
                         if allowed_names is not None:
@@ -250,15 +261,10 @@ class ContextBuilder:
         if self._mcp_tools_prompt:
             prompts.append(f"## MCP Tools\n{self._mcp_tools_prompt}")
         # 追加被熔断禁用的工具提示（避免无效调用）
-        disabled_tools = []
-        if hasattr(self.tool_registry, "get_disabled_tools"):
-            try:
-                disabled_tools = self.tool_registry.get_disabled_tools()
-            except Exception:
-                disabled_tools = []
+        disabled_tools = self._disabled_tools()
         if disabled_tools:
             block = ["## Disabled Tools (temporary)\n"]
-            for name in sorted(disabled_tools):
+            for name in disabled_tools:
                 block.append(f"- {name}\n")
             prompts.append("".join(block))
         return "\n\n".join(p for p in prompts if p)
@@ -266,28 +272,44 @@ class ContextBuilder:
     def _resource_root(self) -> Path:
         return Path(self.resource_root or self.project_root)
 
+    def _disabled_tools(self) -> tuple:
+        try:
+            return tuple(sorted(self.tool_registry.get_disabled_tools()))
+        except Exception:
+            return ()
+
+    def _prompt_source_key(self) -> tuple:
+        """由所有 prompt 源文件的 (mtime_ns, size) 与熔断工具组成的失效键。"""
+        prompts_root = self._resource_root() / "prompts"
+        paths = sorted((prompts_root / "tools_prompts").glob("*.py"))
+        if not self.system_prompt_override:
+            paths.append(prompts_root / "agents_prompts" / "L1_system_prompt.py")
+        paths.extend(Path(self.project_root) / name for name in ("code_law.md", "CODE_LAW.md"))
+        return (tuple((str(path), _file_stamp(path)) for path in paths), self._disabled_tools())
+
+    def _run_prompt_file(self, path: Path) -> Dict[str, str]:
+        """执行 prompt 模块并按 (mtime_ns, size) 缓存其字符串变量。"""
+        stamp, cached = _file_stamp(path), self._prompt_file_cache.get(str(path))
+        if cached is not None and cached[0] == stamp:
+            return cached[1]
+        data = {name: value for name, value in runpy.run_path(str(path)).items() if isinstance(value, str)}
+        self._prompt_file_cache[str(path)] = (stamp, data)
+        return data
+
     def _load_code_law(self) -> str:
-        """加载 CODE_LAW.md（基于内容 hash 刷新缓存）"""
+        """加载 CODE_LAW.md（基于 mtime_ns/size 刷新缓存）"""
         for filename in ("code_law.md", "CODE_LAW.md"):
             code_law_path = Path(self.project_root) / filename
-            if not code_law_path.exists():
+            stamp = _file_stamp(code_law_path)
+            if stamp is None:
                 continue
+            if self._cached_code_law_stamp == stamp:
+                return self._cached_code_law
             try:
-                mtime = code_law_path.stat().st_mtime
                 content = code_law_path.read_text(encoding="utf-8")
             except OSError:
                 return ""
-            content_hash = _hash_text(content)
-            if (
-                self._cached_code_law_mtime == mtime
-                and self._cached_code_law_hash == content_hash
-                and self._cached_code_law == content
-            ):
-                return self._cached_code_law
-            self._cached_code_law = content
-            self._cached_code_law_mtime = mtime
-            self._cached_code_law_hash = content_hash
-            self._cached_assembly = None
+            self._cached_code_law, self._cached_code_law_stamp = content, stamp
             return self._cached_code_law
         return ""
 
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""Micro-benchmark: slotted history messages against the former pydantic model.
+
+Run from the repository root: ``python scripts/bench_history_messages.py``.
+"""
+
+from __future__ import annotations
+
+import sys
+import time
+from pathlib import Path
+import tracemalloc
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from pydantic import BaseModel
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from runtime.history import HistoryManager, Message, MessageRole
+
+MESSAGE_COUNT = 10_000
+
+
+class _PydanticMessage(BaseModel):
+    """The previous ``runtime.history.Message`` shape, kept only as a baseline."""
+
+    content: str
+    role: MessageRole
+    timestamp: datetime = None
+    metadata: Optional[Dict[str, Any]] = None
+
+    def __init__(self, content: str, role: MessageRole, **kwargs):
+        super().__init__(
+            content=content,
+            role=role,
+            timestamp=kwargs.get("timestamp", datetime.now()),
+            metadata=kwargs.get("metadata", {}),
+        )
+
+
+def _build(message_type) -> list:
+    return [
+        message_type(content=f"message {index}", role="user", metadata={"step": index})
+        for index in range(MESSAGE_COUNT)
+    ]
+
+
+def _best_seconds(callable_, repeats: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeats):
+        started = time.perf_counter()
+        callable_()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def _allocated_bytes(callable_) -> int:
+    tracemalloc.start()
+    try:
+        kept = callable_()
+        current, _peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    assert len(kept) == MESSAGE_COUNT
+    return current
+
+
+def main() -> int:
+    slotted_append = _best_seconds(lambda: _build(Message))
+    pydantic_append = _best_seconds(lambda: _build(_PydanticMessage))
+
+    items = [
+        {"role": "user", "content": f"message {index}", "metadata": {"step": index}}
+        for index in range(MESSAGE_COUNT)
+    ]
+    history = HistoryManager()
+    slotted_resume = _best_seconds(lambda: history.load_messages(items))
+    pydantic_resume = _best_seconds(
+        lambda: [
+            _PydanticMessage(content=item["content"], role=item["role"], metadata=item["metadata"])
+            for item in items
+        ]
+    )
+
+    slotted_bytes = _allocated_bytes(lambda: _build(Message))
+    pydantic_bytes = _allocated_bytes(lambda: _build(_PydanticMessage))
+
+    print(
+        f"{MESSAGE_COUNT} messages: append {slotted_append * 1000:.1f}ms vs {pydantic_append * 1000:.1f}ms, "
+        f"resume {slotted_resume * 1000:.1f}ms vs {pydantic_resume * 1000:.1f}ms, "
+        f"memory {slotted_bytes // 1024}KiB vs {pydantic_bytes // 1024}KiB"
+    )
+    assert history.get_message_count() == MESSAGE_COUNT
+    return 0 if slotted_append < pydantic_append and slotted_bytes < pydantic_bytes else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
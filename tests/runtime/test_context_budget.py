@@ -57,3 +57,59 @@ def test_context_budget_policy_estimates_message_content_and_tool_calls():
     )
 
     assert decision.estimated_tokens > 0
+
+
+def test_default_estimator_rounds_each_message_down_on_its_own():
+    policy = ContextBudgetPolicy(Config())
+    history = HistoryManager()
+    for _ in range(3):
+        history.append_user("ab")
+
+    # Three 2-char messages cost 0 tokens each, not (6 chars) // 3 == 2 for the whole context.
+    assert policy.estimate_tokens(history.get_messages(), "abcd") == 1
+    assert policy.message_tokens(history.get_messages()[0]) == 0
+
+
+class _CountingEstimator:
+    def __init__(self):
+        self.calls = 0
+
+    def count(self, text):
+        self.calls += 1
+        return len(text)
+
+
+def test_projection_estimate_costs_each_history_message_once_and_rebases_on_checkpoint():
+    from runtime.context import CompactStore, ProjectionBuilder
+
+    estimator = _CountingEstimator()
+    policy = ContextBudgetPolicy(Config(), estimator=estimator)
+    store = CompactStore()
+    projector = ProjectionBuilder(store)
+    history = HistoryManager()
+    for index in range(6):
+        history.append_user(f"question {index}")
+        history.append_assistant(f"answer {index}")
+
+    messages = history.get_messages()
+    projection = projector.project(messages)
+    assert policy.estimate_projection_tokens(messages, projection, "x") == policy.estimate_tokens(
+        projection.messages, "x"
+    )
+
+    history.append_user("follow-up")
+    messages = history.get_messages()
+    estimator.calls = 0
+    policy.estimate_projection_tokens(messages, projector.project(messages))
+    assert estimator.calls == 2  # pending input + the one appended message
+
+    store.create_checkpoint(
+        summary="summary text", source_message_count=len(messages), retain_start_idx=8, messages_compacted=8
+    )
+    projection = projector.project(messages)
+    assert policy.estimate_projection_tokens(messages, projection) == policy.estimate_tokens(projection.messages)
+
+    history.load_messages([{"role": "user", "content": "resumed"}])
+    store.clear()
+    messages = history.get_messages()
+    assert policy.estimate_projection_tokens(messages, projector.project(messages)) == len("resumed")
@@ -30,7 +30,7 @@ def test_model_view_tracks_counts_and_estimated_chars():
     assert view.warnings == ()
 
 
-def test_projection_returns_copy_without_mutating_history():
+def test_projection_returns_read_only_view_without_mutating_history():
     history = HistoryManager()
     history.append_user("q1")
     history.append_assistant("a1")
@@ -39,7 +39,7 @@ def test_projection_returns_copy_without_mutating_history():
     projected = ProjectionBuilder().project(before)
 
     assert projected.messages == before
-    assert projected.messages is not before
+    assert not hasattr(projected.messages, "append")
     assert history.get_message_count() == 2
     assert projected.source_message_count == 2
     assert projected.projection_mode == "full_history"
@@ -336,3 +336,67 @@ def test_context_engine_reset_clears_checkpoint_and_usage():
     assert engine.compact_store.active_checkpoint is None
     assert engine.last_usage_tokens == 0
     assert engine.total_usage_tokens == 0
+
+
+def test_normalizer_incremental_reuses_prefix_and_only_normalizes_new_messages(monkeypatch):
+    history = HistoryManager()
+    history.append_user("q1")
+    history.append_assistant("a1")
+    normalizer = MessageNormalizer()
+    first = normalizer.normalize_incremental(history.get_messages(), "ckpt-1")
+
+    seen = []
+    original = normalizer._normalize_one
+    monkeypatch.setattr(normalizer, "_normalize_one", lambda msg: seen.append(msg) or original(msg))
+    history.append_user("q2")
+    second = normalizer.normalize_incremental(history.get_messages(), "ckpt-1")
+
+    assert [msg.content for msg in seen] == ["q2"]
+    assert second == first + [{"role": "user", "content": "q2"}]
+    assert second == normalizer.normalize(history.get_messages())
+
+    seen.clear()
+    normalizer.normalize_incremental(history.get_messages(), "ckpt-2")
+    assert len(seen) == 3
+
+
+def test_stable_prefix_mode_places_session_memory_after_history_and_keeps_prefix_hash():
+    from runtime.session_memory import SessionMemory, SessionMemoryItem, TranscriptEventRange
+
+    def memory(text):
+        source = TranscriptEventRange(start_event_id="e", end_event_id="e", start_step=0, end_step=0)
+        return SessionMemory(current_goal=SessionMemoryItem(text=text, source=source))
+
+    history = HistoryManager()
+    history.append_user("hello")
+    engine = ContextEngine(context_builder=_FakeContextBuilder(), config=Config(stable_prefix_context=True))
+    engine.set_session_memory(memory("goal one"))
+    first = engine.build_model_view(history_manager=history)
+    engine.set_session_memory(memory("goal two"))
+    second = engine.build_model_view(history_manager=history)
+
+    assert second.messages[1] == {"role": "user", "content": "hello"}
+    assert "Session Memory" in second.messages[-1]["content"]
+    assert second.stable_prefix_message_count == 2
+    assert second.stable_prefix_hash == first.stable_prefix_hash
+    assert second.stable_prefix_chars == first.stable_prefix_chars > 0
+
+
+def test_stable_prefix_hash_encodes_only_new_messages_and_matches_a_fresh_hash(monkeypatch):
+    from runtime.context import engine as engine_module
+
+    history = HistoryManager()
+    history.append_user("hello")
+    engine = ContextEngine(context_builder=_FakeContextBuilder(), config=Config(stable_prefix_context=True))
+    engine.build_model_view(history_manager=history)
+    encoded = []
+    real_dumps = engine_module.json.dumps
+    monkeypatch.setattr(engine_module.json, "dumps", lambda value, **kw: encoded.append(value) or real_dumps(value, **kw))
+    history.append_assistant("hi")
+    view = engine.build_model_view(history_manager=history)
+
+    assert encoded == [{"role": "assistant", "content": "hi"}]
+    fresh = ContextEngine(context_builder=_FakeContextBuilder(), config=Config(stable_prefix_context=True))
+    assert fresh.build_model_view(history_manager=history).stable_prefix_hash == view.stable_prefix_hash
+    off = ContextEngine(context_builder=_FakeContextBuilder(), config=Config(stable_prefix_context=False))
+    assert off.build_model_view(history_manager=history).stable_prefix_hash == ""
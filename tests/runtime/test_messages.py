@@ -27,3 +27,13 @@ def test_history_manager_serialization_roundtrip_preserves_metadata():
 
     assert restored.get_message_count() == 2
     assert restored.get_messages()[1].metadata["step"] == 1
+
+
+def test_messages_are_slotted_records_without_an_instance_dict():
+    message = Message(content="hello", role="user", metadata={"step": 1})
+
+    assert "content" in Message.__slots__ and "metadata" in Message.__slots__
+    assert not hasattr(message, "__dict__")
+    history = HistoryManager()
+    history.load_messages([{"role": "user", "content": "hello", "metadata": {"step": 1}}])
+    assert all(type(item) is Message for item in history.get_messages())
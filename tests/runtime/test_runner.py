@@ -1122,6 +1122,31 @@ def test_runtime_runner_delegates_tool_execution_to_orchestrator():
     assert host.history_manager.messages[-2]["role"] == "tool"
 
 
+def test_runtime_runner_streams_and_prefetches_tool_calls_when_enabled():
+    from runtime.loop import RuntimeRunner
+
+    host = _ToolThenFinalHost()
+    host.config.stream_tool_dispatch = True
+    prefetched = []
+    host.tool_orchestrator.prefetch = lambda call, *, step, trace_logger: prefetched.append((step, call))
+    blocking_llm = host.llm
+
+    class _StreamingLLM:
+        def invoke_raw(self, *_args, **_kwargs):
+            raise AssertionError("streaming mode must not use the blocking call")
+
+        def invoke_raw_stream(self, messages, on_tool_call=None, tools=None, tool_choice=None):
+            response = blocking_llm.invoke_raw(messages, tools=tools, tool_choice=tool_choice)
+            for call in host._extract_tool_calls(response):
+                on_tool_call(call)
+            return response
+
+    host.llm = _StreamingLLM()
+
+    assert RuntimeRunner(host).run("hello world", show_raw=False) == "tool done"
+    assert prefetched == [(1, {"id": "call_1", "name": "Echo", "arguments": '{"text": "hi"}'})]
+
+
 def test_runtime_runner_preserves_invalid_param_tool_observation():
     from runtime.loop import RuntimeRunner
 
@@ -548,7 +548,8 @@ def test_cancelling_active_transcript_run_records_terminal_and_preserves_uncerta
     assert [action.tool_call_id for action in resume.uncertain_actions] == ["call-2"]
 
 
-def test_cancelling_active_turn_emits_terminal_to_runtime_event_sink(tmp_path: Path):
+def test_cancelling_active_turn_emits_terminal_to_runtime_event_sink(tmp_path: Path, monkeypatch):
+    import runtime.host
     from runtime.host import CodeAgent
     from runtime.transcript import TranscriptRecorder, TranscriptStore
 
@@ -567,11 +568,15 @@ def test_cancelling_active_turn_emits_terminal_to_runtime_event_sink(tmp_path: P
     _configure_runtime_host(agent, recorder)
     agent.runtime_event_sink = Sink()
     agent._active_transcript_run_id = "run-1"
+    flushed = []
+    monkeypatch.setattr(runtime.host.WORKSPACE_DURABILITY, "flush", lambda: flushed.append(len(emitted)))
 
     assert CodeAgent.cancel_active_turn(agent) == {"cancelled": True, "run_id": "run-1"}
     assert [(event.run_id, event.step, event.type, event.payload) for event in emitted] == [
         ("run-1", 2, "terminal", {"reason": "interrupted", "details": {"cancelled": True}})
     ]
+    # Writes the interrupted turn queued reach disk before its terminal fact.
+    assert flushed == [0]
 
 
 def test_cancelling_the_same_active_turn_twice_records_one_terminal(tmp_path: Path):
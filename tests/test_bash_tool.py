@@ -1,5 +1,6 @@
 import shlex
 import sys
+import time
 
 import pytest
 
@@ -110,3 +111,39 @@ def test_timeout_with_output_partial(bash_tool):
     assert status == ToolStatus.PARTIAL
     data = _extract_data(result)
     assert "hi" in data["stdout"]
+
+
+def test_large_output_keeps_head_and_tail_and_spills_the_full_stream(bash_tool, tmp_path):
+    script = "import sys; sys.stdout.write(''.join(f'{n:07d}\\n' for n in range(40000)))"
+    result = bash_tool.run({"command": f"{PYTHON} -c {shlex.quote(script)}"})
+
+    data = _extract_data(result)
+    assert _extract_status(result) == ToolStatus.SUCCESS
+    assert data["truncated"] is True
+    assert result.stats["stdout_bytes"] == 320000
+    assert data["stdout"].startswith("0000000\n") and data["stdout"].endswith("0039999\n")
+    assert len(data["stdout"]) < 70000
+    spilled = data["stdout"].split("full output: ")[1].split(")")[0]
+    assert (tmp_path / spilled).read_bytes() == "".join(f"{n:07d}\n" for n in range(40000)).encode()
+
+
+def test_background_child_holding_the_pipes_cannot_outlast_the_timeout(bash_tool):
+    started = time.monotonic()
+    result = bash_tool.run({"command": "sleep 5 & echo hi", "timeout_ms": 1000})
+
+    assert time.monotonic() - started < 3
+    assert _extract_status(result) == ToolStatus.PARTIAL
+    assert _extract_data(result)["stdout"] == "hi\n"
+    assert _extract_data(result)["truncated"] is True
+    assert "Output incomplete" in result.text
+
+
+def test_cut_output_decodes_whole_characters_at_both_edges(bash_tool):
+    # One ASCII byte on each side puts both the head and the tail cut inside a two-byte character.
+    script = "import sys; sys.stdout.buffer.write(('x' + 'é' * 40000 + 'y').encode())"
+    result = bash_tool.run({"command": f"{PYTHON} -c {shlex.quote(script)}"})
+
+    stdout = _extract_data(result)["stdout"]
+    assert _extract_data(result)["truncated"] is True
+    assert "�" not in stdout
+    assert stdout.startswith("xéé") and stdout.endswith("ééy")
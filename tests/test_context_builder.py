@@ -1,7 +1,10 @@
 """ContextBuilder tests."""
 
+import runpy
 import time
 import unittest
+from pathlib import Path
+from unittest import mock
 
 from runtime.prompt_builder import ContextBuilder
 from tests.utils.test_helpers import create_temp_project
@@ -173,6 +176,40 @@ class TestContextBuilder(unittest.TestCase):
             self.assertNotEqual(skill_once.tool_contracts_fingerprint, mcp_once.tool_contracts_fingerprint)
             self.assertEqual(mcp_once.tool_contracts_fingerprint, mcp_twice.tool_contracts_fingerprint)
 
+    def test_unchanged_sources_reuse_assembly_without_rerunning_prompt_files(self):
+        structure = {
+            "prompts/agents_prompts/L1_system_prompt.py": "system_prompt = 'L1 {tools}'",
+            "prompts/tools_prompts/glob_prompt.py": "glob_prompt = 'Glob tool'",
+        }
+        with self._make_project(structure) as project:
+            builder = ContextBuilder(tool_registry=DummyToolRegistry(), project_root=str(project.root))
+            first = builder.get_prompt_assembly()
+            with mock.patch("runtime.prompt_builder.runpy.run_path") as run_path:
+                second = builder.get_prompt_assembly()
+            run_path.assert_not_called()
+            self.assertIs(first, second)
+
+    def test_changed_tool_prompt_file_reloads_only_that_file(self):
+        structure = {
+            "prompts/agents_prompts/L1_system_prompt.py": "system_prompt = 'L1 {tools}'",
+            "prompts/tools_prompts/glob_prompt.py": "glob_prompt = 'Glob tool'",
+            "prompts/tools_prompts/grep_prompt.py": "grep_prompt = 'Grep tool'",
+        }
+        with self._make_project(structure) as project:
+            builder = ContextBuilder(tool_registry=DummyToolRegistry(), project_root=str(project.root))
+            first = builder.get_prompt_assembly()
+            project.path("prompts/tools_prompts/grep_prompt.py").write_text(
+                "grep_prompt = 'Grep tool v2'", encoding="utf-8"
+            )
+            with mock.patch("runtime.prompt_builder.runpy.run_path", side_effect=runpy.run_path) as run_path:
+                second = builder.get_prompt_assembly()
+
+            self.assertEqual(
+                [Path(call.args[0]).name for call in run_path.call_args_list], ["grep_prompt.py"]
+            )
+            self.assertIn("Grep tool v2", second.tool_contract_messages[0]["content"])
+            self.assertNotEqual(first.tool_contracts_fingerprint, second.tool_contracts_fingerprint)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -2,7 +2,7 @@
 
 import unittest
 
-from runtime.history import HistoryManager, Message
+from runtime.history import HistoryManager, HistoryView, Message
 
 
 class TestHistoryManager(unittest.TestCase):
@@ -38,12 +38,30 @@ class TestHistoryManager(unittest.TestCase):
         self.assertEqual(msg.role, "summary")
         self.assertIn("generated_at", msg.metadata)
 
-    def test_get_messages_returns_copy(self):
+    def test_get_messages_returns_read_only_fenced_view(self):
         hm = HistoryManager()
         hm.append_user("a")
         msgs = hm.get_messages()
-        msgs.append(Message(content="b", role="user"))
-        self.assertEqual(hm.get_message_count(), 1)
+        with self.assertRaises(AttributeError):
+            msgs.append(Message(content="b", role="user"))
+        hm.append_assistant("b")
+        self.assertEqual(len(msgs), 1)
+        self.assertEqual(hm.get_message_count(), 2)
+
+    def test_history_view_slices_without_copying(self):
+        hm = HistoryManager()
+        for text in ("a", "b", "c", "d"):
+            hm.append_user(text)
+        view = hm.get_messages()
+        tail = view[1:]
+        self.assertIsInstance(tail, HistoryView)
+        self.assertEqual([m.content for m in tail], ["b", "c", "d"])
+        self.assertEqual(tail[-1].content, "d")
+        self.assertEqual([m.content for m in tail[1:2]], ["c"])
+        self.assertEqual([m.content for m in view[::2]], ["a", "c"])
+        self.assertIs(tail[0], view[1])
+        with self.assertRaises(IndexError):
+            tail[3]
 
     def test_round_identification_with_summary(self):
         hm = HistoryManager()
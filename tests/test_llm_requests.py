@@ -132,3 +132,44 @@ def test_stream_invoke_yields_nonempty_text_chunks(monkeypatch):
 
     assert list(llm.stream_invoke([{"role": "user", "content": "stream"}])) == ["one", "two"]
     assert completions.requests[0]["stream"] is True
+
+
+def _delta_chunk(delta, finish_reason=None):
+    return {"choices": [{"delta": delta, "finish_reason": finish_reason}]}
+
+
+def test_stream_assembly_rebuilds_tool_calls_and_announces_each_when_complete():
+    from core.llm import assemble_stream_response, extract_response_content, extract_tool_calls
+
+    announced = []
+    announced_after_chunk = []
+    chunks = [
+        _delta_chunk({"content": "Looking"}),
+        _delta_chunk({"tool_calls": [{"index": 0, "id": "c1", "function": {"name": "Read", "arguments": '{"pa'}}]}),
+        _delta_chunk({"tool_calls": [{"index": 0, "function": {"arguments": 'th": "a.py"}'}}]}),
+        _delta_chunk({"tool_calls": [{"index": 1, "id": "c2", "function": {"name": "Grep", "arguments": '{"pattern"'}}]}),
+        _delta_chunk({"tool_calls": [{"index": 1, "function": {"arguments": ': "x"}'}}]}, "tool_calls"),
+    ]
+
+    def stream():
+        for chunk in chunks:
+            yield chunk
+            announced_after_chunk.append(len(announced))
+
+    response = assemble_stream_response(stream(), announced.append)
+
+    assert announced_after_chunk == [0, 0, 1, 1, 2]
+    assert [call["name"] for call in announced] == ["Read", "Grep"]
+    assert extract_response_content(response) == "Looking"
+    assert extract_tool_calls(response) == announced
+    assert response["choices"][0]["finish_reason"] == "tool_calls"
+
+
+def test_invoke_raw_stream_requests_streaming_and_returns_the_assembled_response(monkeypatch):
+    llm = _llm(monkeypatch)
+    completions = _set_completions(llm, [iter([_delta_chunk({"content": "hi"}, "stop")])])
+
+    response = llm.invoke_raw_stream([{"role": "user", "content": "hello"}])
+
+    assert completions.requests[0]["stream"] is True
+    assert response["choices"][0]["message"]["content"] == "hi"
@@ -3,6 +3,10 @@
 from __future__ import annotations
 
 import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
 
 
 class _Response:
@@ -31,7 +35,84 @@ class _StreamingResponse(_Response):
         )
 
 
-def test_chat_completions_posts_openai_shape_and_exposes_attribute_response(monkeypatch):
+class _ChatHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    requests: list = []
+    connections: set = set()
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers["Content-Length"]))
+        type(self).requests.append((self.path, dict(self.headers), json.loads(body)))
+        type(self).connections.add(self.client_address)
+        if self.path.endswith("/fail/chat/completions"):
+            payload, status = b'{"error":"boom"}', 500
+        else:
+            payload, status = b'{"choices":[{"message":{"content":"hello"}}]}', 200
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *_args):
+        return None
+
+
+@pytest.fixture
+def chat_server(monkeypatch):
+    for name in ("http_proxy", "HTTP_PROXY", "https_proxy", "HTTPS_PROXY", "all_proxy", "ALL_PROXY"):
+        monkeypatch.delenv(name, raising=False)
+    _ChatHandler.requests = []
+    _ChatHandler.connections = set()
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _ChatHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_port}"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_chat_completions_posts_openai_shape_and_exposes_attribute_response(chat_server):
+    from core.openai_compat import OpenAICompatibleClient
+
+    response = OpenAICompatibleClient("secret", f"{chat_server}/v1", 12).chat.completions.create(
+        model="test-model", messages=[{"role": "user", "content": "hi"}]
+    )
+
+    path, headers, body = _ChatHandler.requests[0]
+    assert path == "/v1/chat/completions"
+    assert headers["Authorization"] == "Bearer secret"
+    assert body["model"] == "test-model"
+    assert response.choices[0].message.content == "hello"
+    assert response.model_dump() == {"choices": [{"message": {"content": "hello"}}]}
+
+
+def test_repeated_completions_reuse_one_keep_alive_connection(chat_server):
+    from core.openai_compat import OpenAICompatibleClient
+
+    client = OpenAICompatibleClient("secret", f"{chat_server}/keepalive", 12)
+    for _ in range(40):
+        client.chat.completions.create(model="m", messages=[{"role": "user", "content": "hi"}])
+
+    stats = client.transport_stats()
+    assert len(_ChatHandler.requests) == 40
+    assert len(_ChatHandler.connections) == 1
+    assert stats["connections_opened"] == 1
+    assert stats["pool_hits"] == 39
+    assert stats["connect_ms"] >= 0
+
+
+def test_http_errors_keep_the_runtime_error_surface(chat_server):
+    from core.openai_compat import OpenAICompatibleClient
+
+    client = OpenAICompatibleClient("secret", f"{chat_server}/fail", 12)
+    with pytest.raises(RuntimeError, match="returned HTTP 500"):
+        client.chat.completions.create(model="m", messages=[])
+
+
+def test_proxied_environments_fall_back_to_urllib(monkeypatch):
     from core.openai_compat import OpenAICompatibleClient
     import core.openai_compat as transport
 
@@ -39,22 +120,17 @@ def test_chat_completions_posts_openai_shape_and_exposes_attribute_response(monk
 
     def fake_urlopen(request, timeout):
         captured["url"] = request.full_url
-        captured["headers"] = dict(request.header_items())
-        captured["body"] = json.loads(request.data)
         captured["timeout"] = timeout
         return _Response(b'{"choices":[{"message":{"content":"hello"}}]}')
 
+    monkeypatch.setenv("https_proxy", "http://proxy.example:3128")
     monkeypatch.setattr(transport, "urlopen", fake_urlopen)
     response = OpenAICompatibleClient("secret", "https://example.test/v1", 12).chat.completions.create(
         model="test-model", messages=[{"role": "user", "content": "hi"}]
     )
 
-    assert captured["url"] == "https://example.test/v1/chat/completions"
-    assert captured["headers"]["Authorization"] == "Bearer secret"
-    assert captured["body"]["model"] == "test-model"
-    assert captured["timeout"] == 12
+    assert captured == {"url": "https://example.test/v1/chat/completions", "timeout": 12}
     assert response.choices[0].message.content == "hello"
-    assert response.model_dump() == {"choices": [{"message": {"content": "hello"}}]}
 
 
 def test_chat_completions_stream_yields_sse_chunks(monkeypatch):
@@ -70,3 +146,93 @@ def test_chat_completions_stream_yields_sse_chunks(monkeypatch):
     )
 
     assert [chunk.choices[0].delta.content for chunk in chunks] == ["one", "two"]
+
+
+def test_request_body_encoder_splices_new_messages_and_reuses_bytes_on_retry(chat_server):
+    from core.openai_compat import OpenAICompatibleClient, _BodyEncoder
+
+    history = [{"role": "user", "content": f"message {index}"} for index in range(50)]
+    client = OpenAICompatibleClient("secret", f"{chat_server}/v1", 12)
+    client.chat.completions.create(model="m", messages=list(history))
+    history.append({"role": "assistant", "content": "reply ✓"})
+    client.chat.completions.create(model="m", messages=list(history), temperature=0.2)
+
+    assert _ChatHandler.requests[-1][2] == {"model": "m", "messages": history, "temperature": 0.2}
+    stats = client.transport_stats()
+    assert stats["encoded_messages"] == 51
+    assert stats["reused_messages"] == 50
+    assert stats["encode_ms"] >= 0
+
+    encoder = _BodyEncoder()
+    payload = {"model": "m", "messages": history}
+    first = encoder.encode(payload)
+    assert encoder.encode(dict(payload)) is first
+    assert json.loads(first) == payload
+
+    # Fragments follow content, not identity: a message edited in place is encoded again.
+    history[0]["content"] = "edited"
+    history[1]["metadata"] = {"tags": ["a"]}
+    edited = encoder.encode(payload)
+    assert json.loads(edited) == payload
+    history[1]["metadata"]["tags"].append("b")
+    assert json.loads(encoder.encode(payload)) == payload
+    assert encoder.stats["encoded_messages"] == 51 + 3
+
+
+class _FakeConnection:
+    def __init__(self, error=None):
+        self.error, self.closed, self.sent = error, False, 0
+
+    def request(self, *_args, **_kwargs):
+        self.sent += 1
+        if self.error is not None:
+            raise self.error
+
+    def close(self):
+        self.closed = True
+
+
+class _FakePool:
+    path = ""
+
+    def __init__(self, *connections):
+        self.connections = list(connections)
+
+    def acquire(self, _timeout):
+        return self.connections.pop(0), True
+
+
+@pytest.mark.parametrize(
+    ("error", "retried"),
+    [(ConnectionResetError("reset"), True), (BrokenPipeError("pipe"), True), (TimeoutError("timed out"), False)],
+)
+def test_pooled_request_retries_only_a_dropped_keep_alive_socket(error, retried):
+    from core.openai_compat import OpenAICompatibleClient
+
+    client = OpenAICompatibleClient("secret", "http://127.0.0.1:1/v1", 12)
+    first, second = _FakeConnection(error), _FakeConnection(RuntimeError("second attempt"))
+    client._pool = _FakePool(first, second)
+
+    with pytest.raises(RuntimeError) as raised:
+        client._pooled_request(b"{}", {})
+
+    assert first.closed and first.sent == 1
+    assert second.sent == (1 if retried else 0)
+    assert ("second attempt" in str(raised.value)) is retried
+
+
+def test_abandoned_pooled_response_closes_without_draining_the_body():
+    from core.openai_compat import _PooledResponse
+
+    class _Unread:
+        will_close = False
+
+        def read(self):
+            raise AssertionError("an aborted stream must not wait for the rest of the body")
+
+    conn = _FakeConnection()
+    with pytest.raises(GeneratorExit):
+        with _PooledResponse(_Unread(), conn, _FakePool()):
+            raise GeneratorExit
+
+    assert conn.closed
@@ -7,7 +7,10 @@
     python -m unittest tests.test_read_tool -v
 """
 
+import os
 import unittest
+from pathlib import Path
+from unittest import mock
 from tools.builtin.read_file import ReadTool
 from tests.utils.protocol_validator import ProtocolValidator
 from tests.utils.test_helpers import create_temp_project, parse_response
@@ -130,6 +133,53 @@ class TestReadTool(unittest.TestCase):
             self.assertNotIn("9 |", content)
             self.assertNotIn("15 |", content)
 
+    def test_success_pagination_seeks_with_line_offset_index(self):
+        """Success: 翻页复用行偏移索引，只解码所需字节区间；文件变更后重建"""
+        with create_temp_project() as project:
+            lines = [f"line {i} ✓\r\n" if i % 3 else f"line {i}\n" for i in range(1, 101)]
+            path = project.create_file("paged.txt", "".join(lines))
+
+            tool = ReadTool(project_root=project.root)
+            first = parse_response(tool.run({"path": "paged.txt", "start_line": 1, "limit": 5}))
+            inspections, opened = [], []
+            inspect, real_open = tool._workspace.inspect, os.open
+            tool._workspace.inspect = lambda requested: inspections.append(requested) or inspect(requested)
+
+            def recording_open(target, *args):
+                opened.append(target)
+                return real_open(target, *args)
+
+            with mock.patch("tools.workspace.os.open", recording_open):
+                page = parse_response(tool.run({"path": "paged.txt", "start_line": 40, "limit": 3}))
+
+            # 一次 open：二进制/大小检查与区间读取都在同一个描述符上完成
+            self.assertEqual(inspections, [])
+            self.assertEqual([Path(target).name for target in opened], ["paged.txt"])
+            self.assertEqual(first["stats"]["content_cache_misses"], 1)
+            self.assertEqual(page["stats"]["line_index_hits"], 1)
+            self.assertEqual(page["stats"]["content_cache_hits"] + page["stats"]["content_cache_misses"], 0)
+            self.assertEqual(first["stats"]["total_lines"], 100)
+            self.assertEqual(page["stats"]["total_lines"], 100)
+            self.assertEqual(page["data"]["content"], "  40 | line 40 ✓\n  41 | line 41 ✓\n  42 | line 42\n")
+
+            Path(path).write_text("changed\n", encoding="utf-8")
+            changed = parse_response(tool.run({"path": "paged.txt"}))
+            self.assertEqual(changed["data"]["content"], "   1 | changed\n")
+            self.assertEqual(changed["stats"]["line_index_hits"], 0)
+
+    def test_cache_stats_report_only_this_call(self):
+        """Success: stats 只统计本次调用的缓存命中，不混入进程级累计值"""
+        with create_temp_project() as project:
+            # 非 UTF-8 文件不建行索引，后续读取走内容缓存
+            Path(project.root, "latin.txt").write_bytes(b"caf\xe9\n")
+
+            tool = ReadTool(project_root=project.root)
+            stats = [parse_response(tool.run({"path": "latin.txt"}))["stats"] for _ in range(3)]
+
+            for index, expected in enumerate([(0, 1), (1, 0), (1, 0)]):
+                self.assertEqual((stats[index]["content_cache_hits"], stats[index]["content_cache_misses"]), expected)
+                self.assertEqual(stats[index]["line_index_hits"], 0)
+
     def test_success_read_to_end_no_truncation(self):
         """Success: 读取到文件末尾，无截断"""
         with create_temp_project() as project:
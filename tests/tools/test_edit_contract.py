@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import difflib
 import json
 
 from runtime.host import CodeAgent
@@ -23,6 +24,10 @@ def _snapshot(path):
     }
 
 
+def _contents(root, *names):
+    return {(root / name).read_text(encoding="utf-8") for name in names}
+
+
 def test_edit_creates_a_new_text_file_atomically(tmp_path):
     response = _response(
         EditTool(project_root=tmp_path),
@@ -159,6 +164,60 @@ def test_edit_dry_run_never_writes(tmp_path):
     assert target.read_text(encoding="utf-8") == "before\n"
 
 
+def test_edit_diff_covers_only_the_changed_span_with_file_line_numbers(tmp_path, monkeypatch):
+    target = tmp_path / "big.txt"
+    target.write_text("".join(f"line {number}\n" for number in range(5000)), encoding="utf-8")
+    tool = EditTool(project_root=tmp_path)
+    edits = [{"old_string": "line 4000\n", "new_string": "changed\n"}]
+
+    response = _response(tool, {"path": "big.txt", "edits": edits, "dry_run": True, **_snapshot(target)})
+
+    assert "@@ -3998,7 +3998,7 @@" in response["data"]["diff_preview"]
+    assert (response["stats"]["lines_added"], response["stats"]["lines_removed"]) == (1, 1)
+
+    edits = [
+        {"old_string": "line 10\n", "new_string": "top\nextra\n"},
+        {"old_string": "line 4990\n", "new_string": "end\n"},
+    ]
+    response = _response(tool, {"path": "big.txt", "edits": edits, "dry_run": True, **_snapshot(target)})
+    preview = response["data"]["diff_preview"]
+
+    assert preview.count("--- a/big.txt") == 1
+    assert "@@ -8,7 +8,8 @@" in preview and "@@ -4988,7 +4989,7 @@" in preview
+    assert (response["stats"]["lines_added"], response["stats"]["lines_removed"]) == (3, 2)
+
+    # Windows too big for difflib are listed plainly, with the same hunk positions and counts.
+    monkeypatch.setattr(EditTool, "MAX_DIFF_WINDOW_CHARS", 100)
+    response = _response(tool, {"path": "big.txt", "edits": edits, "dry_run": True, **_snapshot(target)})
+    preview = response["data"]["diff_preview"]
+
+    assert "@@ -8,7 +8,8 @@" in preview and "-line 8\n\n" in preview and "+line 8\n\n" in preview
+    assert (response["stats"]["lines_added"], response["stats"]["lines_removed"]) == (3, 2)
+
+
+def test_edit_replace_diffs_only_changed_lines_and_stops_at_the_preview_budget(tmp_path, monkeypatch):
+    target = tmp_path / "big.txt"
+    original = [f"line {number}\n" for number in range(20_000)]
+    target.write_text("".join(original), encoding="utf-8")
+    tool = EditTool(project_root=tmp_path)
+    replacement = "".join(original[:100] + ["changed\n"] + original[101:])
+
+    replace = {"path": "big.txt", "create_content": replacement, "dry_run": True, **_snapshot(target)}
+    response = _response(tool, replace)
+
+    assert "@@ -98,7 +98,7 @@" in response["data"]["diff_preview"]
+    assert (response["stats"]["lines_added"], response["stats"]["lines_removed"]) == (1, 1)
+
+    produced = []
+    monkeypatch.setattr(difflib, "unified_diff", lambda *args, **kwargs: produced.append(args) or iter(()))
+    response = _response(tool, {**replace, "create_content": "".join(reversed(original))})
+
+    assert produced == []
+    assert response["data"]["diff_truncated"] is True
+    assert len(response["data"]["diff_preview"].encode("utf-8")) < EditTool.MAX_DIFF_BYTES + 100
+    assert (response["stats"]["lines_added"], response["stats"]["lines_removed"]) == (20_000, 20_000)
+
+
 def test_edit_rejects_a_stale_snapshot_without_changing_the_file(tmp_path):
     target = tmp_path / "notes.txt"
     target.write_text("before\n", encoding="utf-8")
@@ -244,8 +303,52 @@ def test_edit_schema_and_default_host_register_only_edit_for_file_mutation(tmp_p
         "path",
         "edits",
         "create_content",
+        "batch",
         "expected_mtime_ms",
         "expected_size_bytes",
         "dry_run",
     }
     assert schema["required"] == ["path"]
+
+
+def test_edit_batch_commits_files_read_through_the_registry_all_or_nothing(tmp_path):
+    from tools.builtin.read_file import ReadTool
+
+    registry = ToolRegistry()
+    registry.register_tool(ReadTool(project_root=tmp_path))
+    registry.register_tool(EditTool(project_root=tmp_path))
+    for name in ("a.py", "b.py", "c.py"):
+        (tmp_path / name).write_text("import old_name\n", encoding="utf-8")
+        assert registry.execute_tool("Read", {"path": name}).status.value == "success"
+    rename = [{"old_string": "old_name", "new_string": "new_name"}]
+
+    (tmp_path / "c.py").write_text("import old_name  # changed\n", encoding="utf-8")
+    batch = [{"path": "b.py", "edits": rename}, {"path": "c.py", "edits": rename}]
+    stale = registry.execute_tool("Edit", {"path": "a.py", "edits": rename, "batch": batch})
+    assert stale.error_code.value == "CONFLICT"
+    assert _contents(tmp_path, "a.py", "b.py") == {"import old_name\n"}
+
+    batch = [{"path": "b.py", "edits": rename}]
+    result = registry.execute_tool("Edit", {"path": "a.py", "edits": rename, "batch": batch})
+
+    assert result.status.value == "success"
+    assert result.data["files"] == ["a.py", "b.py"]
+    assert result.data["replacements"] == 2
+    assert result.data["diff_preview"].count("+import new_name") == 2
+    assert result.stats["lines_added"] == result.stats["lines_removed"] == 2
+    assert _contents(tmp_path, "a.py", "b.py") == {"import new_name\n"}
+    assert not list(tmp_path.glob(".mycodeagent-*"))
+
+
+def test_edit_batch_rejects_a_file_listed_twice(tmp_path):
+    target = tmp_path / "notes.txt"
+    target.write_text("one two\n", encoding="utf-8")
+    lock = _snapshot(target)
+    entry = {"path": "notes.txt", "edits": [{"old_string": "two", "new_string": "2"}], **lock}
+    first = {"path": "./notes.txt", "edits": [{"old_string": "one", "new_string": "1"}], **lock}
+
+    response = _response(EditTool(project_root=tmp_path), {**first, "batch": [entry]})
+
+    assert response["status"] == "error"
+    assert "more than once" in response["error"]["message"]
+    assert target.read_text(encoding="utf-8") == "one two\n"
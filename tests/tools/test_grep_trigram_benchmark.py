@@ -0,0 +1,109 @@
+"""Benchmark: repeated Grep over a synthetic tree with and without the trigram index."""
+
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+
+from tools.base import serialize_tool_result
+from tools.builtin import search_code
+from tools.builtin._trigram_index import TrigramIndex, required_trigrams
+from tools.builtin.search_code import GrepTool
+
+# The suite runs a 5k-file tree; set GREP_BENCH_FILES=50000 for the full-size benchmark.
+FILE_COUNT = int(os.getenv("GREP_BENCH_FILES", "5000"))
+
+
+def _grep(root: Path, pattern: str) -> dict:
+    return json.loads(serialize_tool_result(GrepTool(project_root=root).run({"pattern": pattern})))["data"]
+
+
+def _counting_file_reads(monkeypatch) -> list[str]:
+    """Record every file the Python fallback opens; the count is the benchmark's cost measure."""
+    opened: list[str] = []
+    original = search_code._file_lines
+
+    def counted(path, prefilter):
+        opened.append(path)
+        return original(path, prefilter)
+
+    monkeypatch.setattr(search_code, "_file_lines", counted)
+    monkeypatch.setattr(GrepTool, "fallback_chunk_files", FILE_COUNT)  # stay in-process, where the patch applies
+    return opened
+
+
+def test_required_trigrams_only_come_from_mandatory_literal_runs():
+    assert required_trigrams("TODO") == {"tod", "odo"}
+    assert required_trigrams("abcd?e") == {"abc"}
+    assert required_trigrams("foo|bar") == set()
+    assert required_trigrams(r"\bneedle") == set()
+
+
+def test_trigram_index_narrows_repeated_greps_on_a_synthetic_tree(tmp_path, monkeypatch):
+    for index in range(FILE_COUNT):
+        directory = tmp_path / f"pkg{index // 500}"
+        if index % 500 == 0:
+            directory.mkdir()
+        body = f"def handler_{index}(request):\n    return request.value + {index}\n"
+        if index % 10_000 == 7:
+            body += "    raise RareSentinelError('needle')\n"
+        (directory / f"module_{index}.py").write_text(body, encoding="utf-8")
+    monkeypatch.setattr("tools.builtin.search_code.shutil.which", lambda _: None)
+    monkeypatch.setenv("TOOL_OUTPUT_DIR", "custom-output")
+    opened = _counting_file_reads(monkeypatch)
+
+    monkeypatch.delenv("GREP_TRIGRAM_INDEX", raising=False)
+    expected = _grep(tmp_path, "RareSentinel")
+    full_scan = len(opened)
+
+    monkeypatch.setenv("GREP_TRIGRAM_INDEX", "true")
+    assert _grep(tmp_path, "RareSentinel") == expected  # builds and persists the index
+    opened.clear()
+    assert _grep(tmp_path, "RareSentinel") == expected
+    indexed = len(opened)
+
+    assert len(expected["matches"]) == len(range(7, FILE_COUNT, 10_000))
+    assert full_scan == FILE_COUNT
+    assert indexed == len(expected["matches"])
+    assert (tmp_path / "custom-output" / ".grep-trigrams.jsonl").exists()
+    assert not (tmp_path / "tool-output").exists()
+
+
+def test_trigram_index_lets_rg_walk_root_when_too_many_files_survive(tmp_path, monkeypatch):
+    for index in range(3):
+        (tmp_path / f"f{index}.txt").write_text("needle\n", encoding="utf-8")
+    monkeypatch.setenv("GREP_TRIGRAM_INDEX", "true")
+    monkeypatch.setattr("tools.builtin.search_code.shutil.which", lambda _: "/usr/bin/rg")
+    handed: list = []
+
+    def fake_rg(self, **kwargs):
+        handed.append(kwargs["candidates"])
+        return [], 0, None
+
+    monkeypatch.setattr(GrepTool, "_rg_matches", fake_rg)
+    tool = GrepTool(project_root=tmp_path)
+    tool.run({"pattern": "needle"})
+    tool.max_narrowed_files = 2
+    tool.run({"pattern": "needle"})
+
+    assert len(handed[0]) == 3
+    assert handed[1] is None
+
+
+def test_trigram_index_appends_changes_and_compacts_superseded_lines(tmp_path):
+    journal = tmp_path / "index.jsonl"
+    files = [tmp_path / f"f{index}.txt" for index in range(4)]
+    for path in files:
+        path.write_text("alpha\n", encoding="utf-8")
+    assert TrigramIndex(journal).narrow(files, {"alp"}) == files
+    files[0].write_text("beta beta\n", encoding="utf-8")
+
+    reloaded = TrigramIndex(journal)
+    assert reloaded.narrow(files, {"alp"}) == files[1:]
+    assert len(journal.read_text(encoding="utf-8").splitlines()) == 5  # one line appended, not rewritten
+
+    for path in files:
+        path.write_text("gamma\n", encoding="utf-8")
+    assert TrigramIndex(journal).narrow(files, {"gam"}) == files
+    assert len(journal.read_text(encoding="utf-8").splitlines()) == 4  # compacted to the live entries
@@ -1,6 +1,9 @@
 import json
+import threading
 import time
 
+import pytest
+
 from tools.orchestrator import (
     ToolBatch,
     ToolCallPlan,
@@ -461,3 +464,90 @@ def test_budget_does_not_restore_or_reprocess_replaced_result(tmp_path, monkeypa
     assert result[0].metadata["replaced"] is True
     assert result[0].raw_result is not None
     assert result[1].metadata["reason"] == "aggregate_message_budget"
+
+
+class _RecordingRegistry:
+    def __init__(self):
+        self.cached_reads = []
+
+    def cache_read_result(self, result, params_input):
+        self.cached_reads.append(params_input)
+
+
+class _RecordingExecutor:
+    def __init__(self):
+        self.calls = []
+        self.registry = _RecordingRegistry()
+
+    def execute(self, name, tool_input, *, trace_logger=None, step=0, cache_reads=True):
+        self.calls.append((name, tool_input))
+        if name == "Read" and cache_reads:
+            self.registry.cache_read_result(None, tool_input)
+        return _success({"tool": name, **tool_input})
+
+
+def test_prefetched_safe_calls_are_consumed_by_run_without_reexecution():
+    host = _Host()
+    host.tool_executor = _RecordingExecutor()
+    orchestrator = ToolOrchestrator(host)
+    call = {"id": "call_1", "name": "Read", "arguments": '{"path": "a.py"}'}
+
+    orchestrator.prefetch(call, step=1, trace_logger=host.trace_logger)
+    result = orchestrator.run([call], step=1, trace_logger=host.trace_logger)
+
+    assert host.tool_executor.calls == [("Read", {"path": "a.py"})]
+    assert host.tool_executor.registry.cached_reads == [{"path": "a.py"}]
+    assert json.loads(result[0].observation)["data"]["path"] == "a.py"
+    assert [event[2]["status"] for event in host.trace_logger.events if event[0] == "tool_lifecycle"] == [
+        "requested",
+        "started",
+        "completed",
+    ]
+
+
+def test_prefetch_stops_at_the_first_unsafe_call_and_discard_resets():
+    host = _Host()
+    host.tool_executor = _RecordingExecutor()
+    orchestrator = ToolOrchestrator(host)
+
+    orchestrator.prefetch({"name": "Edit", "arguments": '{"path": "a.py"}'}, step=1, trace_logger=None)
+    orchestrator.prefetch({"name": "Read", "arguments": '{"path": "a.py"}'}, step=1, trace_logger=None)
+    assert host.tool_executor.calls == []
+
+    orchestrator.discard_prefetched()
+    orchestrator.prefetch({"name": "Grep", "arguments": '{"pattern": "x"}'}, step=1, trace_logger=None)
+    orchestrator.discard_prefetched()
+    orchestrator.run(
+        [{"id": "call_1", "name": "Grep", "arguments": '{"pattern": "x"}'}],
+        step=2,
+        trace_logger=host.trace_logger,
+    )
+
+    assert host.tool_executor.calls == [("Grep", {"pattern": "x"}), ("Grep", {"pattern": "x"})]
+
+
+def test_discarded_prefetches_are_cancelled_never_seed_read_locks_and_close_stops_the_pool():
+    host = _Host()
+    host.tool_executor = _RecordingExecutor()
+    release = threading.Event()
+    execute = host.tool_executor.execute
+    host.tool_executor.execute = lambda *args, **kwargs: release.wait(5) and execute(*args, **kwargs)
+    orchestrator = ToolOrchestrator(host)
+    orchestrator._get_max_concurrency = lambda: 1
+
+    orchestrator.prefetch({"name": "Read", "arguments": '{"path": "a.py"}'}, step=1, trace_logger=None)
+    orchestrator.prefetch({"name": "Read", "arguments": '{"path": "b.py"}'}, step=1, trace_logger=None)
+    running, queued = orchestrator._prefetched.values()
+    pool = orchestrator._prefetch_pool
+    orchestrator.discard_prefetched()
+    release.set()
+    running.result(timeout=5)
+
+    assert queued.cancelled() is True
+    assert host.tool_executor.calls == [("Read", {"path": "a.py"})]
+    assert host.tool_executor.registry.cached_reads == []
+
+    orchestrator.close()
+    assert orchestrator._prefetch_pool is None
+    with pytest.raises(RuntimeError):
+        pool.submit(print)
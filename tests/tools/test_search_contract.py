@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import json
+import re
 from pathlib import Path
 
 import pytest
@@ -166,3 +167,234 @@ def test_grep_marks_limited_results_partial_in_deterministic_order(search_projec
         {"file": "src/app.py", "line": 1, "text": "TODO: implement"}
     ]
     assert response["data"]["truncated"] is True
+
+
+def test_grep_hands_rg_the_root_and_rechecks_only_matched_files(
+    search_project: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    commands = []
+    events = [
+        {"type": "match", "data": {"path": {"text": "./src/app.py"}, "line_number": 1, "lines": {"text": "TODO: implement\n"}}},
+        {"type": "match", "data": {"path": {"text": "./binary.bin"}, "line_number": 1, "lines": {"text": "text\n"}}},
+        {"type": "summary", "data": {"stats": {"searches": 4}}},
+    ]
+    monkeypatch.setattr("tools.builtin.search_code.shutil.which", lambda _: "/usr/bin/rg")
+    monkeypatch.setattr(
+        "tools.builtin.search_code.subprocess.Popen",
+        lambda command, **_kwargs: commands.append(command) or _FakeRipgrep(events),
+    )
+
+    response = _response(GrepTool(project_root=search_project), {"pattern": "TODO|text"})
+
+    assert response["data"]["matches"] == [{"file": "src/app.py", "line": 1, "text": "TODO: implement"}]
+    assert response["stats"]["searched_files"] == 4
+    assert commands[0][-2:] == ["--", "."]
+    assert "--no-ignore" in commands[0] and "--glob=!build" in commands[0]
+    assert response["stats"]["first_match_ms"] >= 0
+
+
+class _FakeRipgrep:
+    def __init__(self, events: list[dict], returncode: int = 0) -> None:
+        self.stdout = self._lines([json.dumps(event) + "\n" for event in events], returncode)
+        self.returncode: int | None = None
+        self.killed = False
+
+    def _lines(self, lines: list[str], returncode: int):
+        yield from lines
+        self.returncode = returncode
+
+    def poll(self):
+        return self.returncode
+
+    def kill(self):
+        self.killed = True
+        self.returncode = -9
+
+    def communicate(self):
+        return "", ""
+
+
+def test_grep_kills_rg_once_limit_plus_one_matches_stream_in(
+    search_project: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    match = {"path": {"text": "./src/app.py"}, "lines": {"text": "TODO\n"}}
+    begin = {"type": "begin", "data": {"path": match["path"]}}
+    matches = [{"type": "match", "data": {**match, "line_number": n}} for n in range(1, 50)]
+    process = _FakeRipgrep([begin, *matches])
+    monkeypatch.setattr("tools.builtin.search_code.shutil.which", lambda _: "/usr/bin/rg")
+    monkeypatch.setattr("tools.builtin.search_code.subprocess.Popen", lambda *_args, **_kwargs: process)
+
+    response = _response(GrepTool(project_root=search_project), {"pattern": "TODO", "limit": 2})
+
+    assert process.killed is True
+    assert len(list(process.stdout)) == 46
+    assert [item["line"] for item in response["data"]["matches"]] == [1, 2]
+    assert response["data"]["truncation_reasons"] == ["match_limit"]
+    assert response["stats"]["searched_files"] == 1
+
+
+def test_grep_parallel_fallback_matches_serial_results_and_stops_at_limit(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    for index in range(6):
+        (tmp_path / f"f{index}.txt").write_text(f"needle {index}\nhay\nneedle again\n", encoding="utf-8")
+    monkeypatch.setattr("tools.builtin.search_code.shutil.which", lambda _: None)
+    serial = _response(GrepTool(project_root=tmp_path), {"pattern": "needle|nothing"})
+
+    tool = GrepTool(project_root=tmp_path)
+    tool.fallback_chunk_files = 2
+    parallel = _response(tool, {"pattern": "needle|nothing"})
+    limited = tool._python_matches(sorted(tmp_path.iterdir()), re.compile("needle"), 3)
+
+    assert parallel["data"] == serial["data"]
+    assert len(serial["data"]["matches"]) == 12
+    assert [(item["file"], item["line"]) for item in limited] == [("f0.txt", 1), ("f0.txt", 3), ("f1.txt", 1), ("f1.txt", 3)]
+
+
+def test_grep_fallback_maps_large_files_with_identical_line_numbers(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    from tools.builtin import search_code
+
+    (tmp_path / "big.log").write_bytes("x\r\nneedle ✓\rmid\n\nneedle\x85tail\n".encode("utf-8"))
+    monkeypatch.setattr("tools.builtin.search_code.shutil.which", lambda _: None)
+    expected = _response(GrepTool(project_root=tmp_path), {"pattern": "needle|tail"})["data"]["matches"]
+    monkeypatch.setattr(search_code, "_MMAP_MIN_BYTES", 1)
+
+    mapped = _response(GrepTool(project_root=tmp_path), {"pattern": "needle|tail"})["data"]["matches"]
+    dotted = GrepTool(project_root=tmp_path)._python_matches(
+        [tmp_path / "big.log"], re.compile("needle .|mi."), 10
+    )
+
+    assert mapped == expected
+    assert [item["line"] for item in mapped] == [2, 5, 6]
+    assert search_code._bytes_prefilter("needle .|mi.", 0) is not None
+    assert [(item["line"], item["text"]) for item in dotted] == [(2, "needle ✓"), (3, "mid")]
+
+
+def test_glob_matchers_are_cached_and_prune_directories_outside_the_literal_prefix(
+    search_project: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    from tools.builtin._search_paths import compile_glob, filter_paths, glob_depth, glob_prefix, iter_files
+    from tools.workspace import FileIndex
+
+    listed = []
+    real_listing = FileIndex.listing
+    monkeypatch.setattr(FileIndex, "listing", lambda self, path: listed.append(path) or real_listing(self, path))
+    (search_project / "docs").mkdir()
+
+    files = iter_files(search_project, prefix=glob_prefix("./src/**/*.py"))
+    matched = list(filter_paths("src/**/*.py", files, search_project))
+
+    assert compile_glob("src/**/*.py") is compile_glob("src/**/*.py")
+    assert glob_prefix("src/**/*.py") == ("src",)
+    assert [path.name for path in matched] == ["app.py", "worker.py"]
+    assert search_project / "docs" not in listed
+    assert search_project / "src" / "nested" in listed
+
+    # Without ``**`` the walk stops at the pattern's depth and skips directories no segment matches.
+    listed.clear()
+    files = iter_files(search_project, prefix=glob_prefix("s*/*.py"), max_depth=glob_depth("s*/*.py"))
+    assert [path.name for path in filter_paths("s*/*.py", files, search_project)] == ["app.py"]
+    assert listed == [search_project, search_project / "src"]
+    assert (glob_prefix("*.py"), glob_depth("*.py"), glob_depth("src/**")) == ((), 0, None)
+    listed.clear()
+    files = list(iter_files(search_project, max_depth=glob_depth("*.py")))
+    assert [path.name for path in files] == ["README.md", "binary.bin"] and listed == [search_project]
+
+
+def test_glob_stops_walking_after_limit_plus_one_matches(tmp_path: Path) -> None:
+    for index in range(20):
+        (tmp_path / f"file_{index:02d}.py").write_text("x\n", encoding="utf-8")
+    (tmp_path / "zz").mkdir()
+    (tmp_path / "zz" / "late.py").write_text("x\n", encoding="utf-8")
+
+    response = _response(GlobTool(project_root=tmp_path), {"pattern": "**/*.py", "limit": 5})
+
+    assert response["data"]["paths"] == [f"file_{index:02d}.py" for index in range(5)]
+    assert response["data"]["truncated"] is True
+    assert response["stats"]["visited"] == 6
+
+
+def test_grep_fallback_scans_in_process_and_drops_a_broken_pool(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    from concurrent.futures import Future
+    from concurrent.futures.process import BrokenProcessPool
+
+    from tools.builtin import search_code
+
+    class BrokenPool:
+        def __init__(self) -> None:
+            self.shut_down = False
+
+        def submit(self, *_args: object) -> Future:
+            future: Future = Future()
+            future.set_exception(BrokenProcessPool("worker died"))
+            return future
+
+        def shutdown(self, **_kwargs: object) -> None:
+            self.shut_down = True
+
+    for index in range(4):
+        (tmp_path / f"f{index}.txt").write_text(f"needle {index}\n", encoding="utf-8")
+    monkeypatch.setattr("tools.builtin.search_code.shutil.which", lambda _: None)
+    broken = BrokenPool()
+    monkeypatch.setattr(search_code, "_FALLBACK_POOL", broken)
+    tool = GrepTool(project_root=tmp_path)
+    tool.fallback_chunk_files = 1
+
+    response = _response(tool, {"pattern": "needle"})
+
+    assert response["status"] == "success"
+    assert [item["file"] for item in response["data"]["matches"]] == [f"f{index}.txt" for index in range(4)]
+    assert broken.shut_down and search_code._FALLBACK_POOL is None
+
+
+def test_grep_rg_deadline_scales_with_the_walked_tree_without_matches(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    for index in range(20):
+        (tmp_path / f"f{index}.txt").write_text("hay\n", encoding="utf-8")
+    deadlines = []
+
+    class _Timer:
+        def __init__(self, interval, _function) -> None:
+            deadlines.append(interval)
+
+        start = cancel = lambda self: None
+
+    monkeypatch.setattr("tools.builtin.search_code.shutil.which", lambda _: "/usr/bin/rg")
+    monkeypatch.setattr(
+        "tools.builtin.search_code.subprocess.Popen", lambda *_args, **_kwargs: _FakeRipgrep([], 1)
+    )
+    monkeypatch.setattr("tools.builtin.search_code.threading.Timer", _Timer)
+    tool = GrepTool(project_root=tmp_path)
+    tool.timeout_seconds, tool.timeout_files_per_second = 1.0, 10
+
+    assert _response(tool, {"pattern": "needle"})["data"]["matches"] == []
+    assert _response(tool, {"pattern": "needle", "glob": "f1*.txt"})["data"]["matches"] == []
+    assert deadlines == [3.0, 2.1]
+
+
+def test_grep_reads_every_rg_match_when_rg_path_order_differs_from_string_order(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    (tmp_path / "a").mkdir()
+    for name in ("a.py", "a/b.py", "a-c.py"):
+        (tmp_path / name).write_text("hit\n", encoding="utf-8")
+    monkeypatch.setattr("tools.builtin.search_code.shutil.which", lambda _: None)
+    fallback = _response(GrepTool(project_root=tmp_path), {"pattern": "hit", "limit": 1})
+    # rg --sort=path compares components, so a/b.py streams before a-c.py and a.py.
+    hit = {"line_number": 1, "lines": {"text": "hit\n"}}
+    order = ("a/b.py", "a-c.py", "a.py")
+    events = [{"type": "match", "data": {"path": {"text": f"./{name}"}, **hit}} for name in order]
+    process = _FakeRipgrep(events)
+    monkeypatch.setattr("tools.builtin.search_code.shutil.which", lambda _: "/usr/bin/rg")
+    monkeypatch.setattr("tools.builtin.search_code.subprocess.Popen", lambda *_args, **_kwargs: process)
+    ripgrep = _response(GrepTool(project_root=tmp_path), {"pattern": "hit", "limit": 1})
+
+    assert process.killed is False
+    assert fallback["data"]["matches"] == [{"file": "a-c.py", "line": 1, "text": "hit"}]
+    assert ripgrep["data"]["matches"] == fallback["data"]["matches"]
+    assert ripgrep["data"]["truncation_reasons"] == ["match_limit"]
@@ -5,6 +5,7 @@ from __future__ import annotations
 import json
 import os
 import stat
+import threading
 
 import pytest
 
@@ -225,3 +226,176 @@ def test_atomic_write_failure_keeps_original_and_cleans_temporary_file(workspace
 
     assert target.read_text(encoding="utf-8") == "before"
     assert not list(workspace.root.glob(".mycodeagent-*.tmp"))
+
+
+def test_file_index_is_shared_and_rescans_only_changed_directories(tmp_path, monkeypatch):
+    from tools.builtin._search_paths import iter_files
+
+    (tmp_path / "src").mkdir()
+    (tmp_path / "src" / "a.py").write_text("a\n", encoding="utf-8")
+    (tmp_path / "docs").mkdir()
+    (tmp_path / "docs" / "b.bin").write_bytes(b"\x00\x01")
+    index = FileWorkspace(tmp_path).file_index()
+    assert FileWorkspace(tmp_path).file_index() is index
+    assert [p.name for p in iter_files(tmp_path, index=index)] == ["b.bin", "a.py"]
+
+    scanned = []
+    real_scandir = os.scandir
+    monkeypatch.setattr(workspace_module.os, "scandir", lambda path: scanned.append(path) or real_scandir(path))
+    assert [p.name for p in iter_files(tmp_path, index=index)] == ["b.bin", "a.py"]
+    assert scanned == []
+
+    (tmp_path / "src" / "c.py").write_text("c\n", encoding="utf-8")
+    assert [p.name for p in iter_files(tmp_path, index=index)] == ["b.bin", "a.py", "c.py"]
+    assert scanned == [tmp_path / "src"]
+    assert index.is_text(tmp_path / "src" / "c.py") and not index.is_text(tmp_path / "docs" / "b.bin")
+
+
+def test_read_text_cache_hits_unchanged_snapshots_and_atomic_write_invalidates(workspace, monkeypatch):
+    monkeypatch.setattr(workspace_module, "TEXT_CACHE", workspace_module.TextCache(max_bytes=64))
+    cache = workspace_module.TEXT_CACHE
+    (workspace.root / "notes.txt").write_text("old\n", encoding="utf-8")
+
+    first = workspace.read_text("notes.txt")
+    assert workspace.read_text("notes.txt") == first
+    assert cache.stats == {"content_cache_hits": 1, "content_cache_misses": 1}
+
+    workspace.atomic_write("notes.txt", "new\n", expected=first[3])
+    assert cache._entries == {}
+    assert workspace.read_text("notes.txt")[0] == "new\n"
+
+    (workspace.root / "big.txt").write_text("x" * 100, encoding="utf-8")
+    workspace.read_text("big.txt")
+    assert cache._bytes == 4
+
+
+def test_read_text_opens_once_and_sniffs_binary_from_the_read_bytes(workspace, monkeypatch):
+    (workspace.root / "notes.txt").write_text("text\n", encoding="utf-8")
+    (workspace.root / "binary.bin").write_bytes(b"text\x00data")
+    opened = []
+    real_open = os.open
+    monkeypatch.setattr(workspace_module.os, "open", lambda *args: opened.append(args[0]) or real_open(*args))
+    monkeypatch.setattr(workspace_module, "TEXT_CACHE", workspace_module.TextCache())
+
+    assert workspace.read_text("notes.txt")[0] == "text\n"
+    with pytest.raises(WorkspaceError, match="binary") as raised:
+        workspace.read_text("binary.bin")
+
+    assert raised.value.kind == "binary"
+    assert opened == [workspace.root / "notes.txt", workspace.root / "binary.bin"]
+    if hasattr(os, "mkfifo"):
+        os.mkfifo(workspace.root / "events.pipe")
+        with pytest.raises(WorkspaceError, match="regular file"):
+            workspace.read_text("events.pipe")
+
+
+def test_atomic_write_many_renames_nothing_when_any_snapshot_is_stale(workspace):
+    for name in ("a.txt", "b.txt"):
+        (workspace.root / name).write_text(f"{name} before", encoding="utf-8")
+    first, second = workspace.inspect("a.txt"), workspace.inspect("b.txt")
+    (workspace.root / "b.txt").write_text("external change", encoding="utf-8")
+
+    with pytest.raises(WorkspaceError, match="modified") as raised:
+        workspace.atomic_write_many([("a.txt", "a after", first), ("b.txt", "b after", second)])
+
+    assert raised.value.kind == "conflict"
+    assert (workspace.root / "a.txt").read_text(encoding="utf-8") == "a.txt before"
+    assert not list(workspace.root.glob(".mycodeagent-*"))
+
+    second = workspace.inspect("b.txt")
+    assert workspace.atomic_write_many([("a.txt", "a after", first), ("b.txt", "b!", second)]) == [7, 2]
+    assert (workspace.root / "b.txt").read_text(encoding="utf-8") == "b!"
+
+
+@pytest.mark.parametrize("hard_links", [True, False])
+def test_atomic_write_many_restores_renamed_files_when_a_later_rename_fails(
+    workspace, monkeypatch, hard_links
+):
+    def refuse_link(_source, _destination):
+        raise PermissionError("hard links not supported")
+
+    if not hard_links:
+        monkeypatch.setattr(workspace_module.os, "link", refuse_link)
+    for name in ("a.txt", "b.txt"):
+        (workspace.root / name).write_text(f"{name} before", encoding="utf-8")
+    writes = [("a.txt", "a after", workspace.inspect("a.txt")), ("b.txt", "b after", workspace.inspect("b.txt"))]
+    real_replace = os.replace
+
+    def fail_second_file(source, destination):
+        if str(destination).endswith("b.txt") and not str(source).endswith(".orig"):
+            raise OSError("simulated replace failure")
+        real_replace(source, destination)
+
+    monkeypatch.setattr(workspace_module.os, "replace", fail_second_file)
+
+    with pytest.raises(OSError, match="simulated replace failure"):
+        workspace.atomic_write_many(writes)
+
+    assert (workspace.root / "a.txt").read_text(encoding="utf-8") == "a.txt before"
+    assert (workspace.root / "b.txt").read_text(encoding="utf-8") == "b.txt before"
+    assert not list(workspace.root.glob(".mycodeagent-*"))
+
+
+def test_atomic_write_many_keeps_a_committed_batch_when_the_durability_step_fails(workspace, monkeypatch):
+    for name in ("a.txt", "b.txt"):
+        (workspace.root / name).write_text(f"{name} before", encoding="utf-8")
+    writes = [(name, f"{name} after", workspace.inspect(name)) for name in ("a.txt", "b.txt")]
+
+    def fail_fsync(_paths, _size):
+        raise OSError("simulated fsync failure")
+
+    monkeypatch.setattr(workspace_module.WORKSPACE_DURABILITY, "renamed", fail_fsync)
+
+    with pytest.raises(OSError, match="simulated fsync failure"):
+        workspace.atomic_write_many(writes)
+
+    assert (workspace.root / "a.txt").read_text(encoding="utf-8") == "a.txt after"
+    assert (workspace.root / "b.txt").read_text(encoding="utf-8") == "b.txt after"
+    assert not list(workspace.root.glob(".mycodeagent-*"))
+
+
+@pytest.mark.parametrize(
+    ("mode", "after_first", "after_second", "after_flush"),
+    [
+        # always: each file is fsynced before its rename and its directory before the write returns.
+        ("always", 2, 4, 4),
+        # group: the second write fills the 8-byte window and syncs both files and their directory once.
+        ("group", 0, 3, 3),
+        # on_run_end: nothing is synced until flush(), which the runtime calls before a terminal event.
+        ("on_run_end", 0, 0, 3),
+    ],
+)
+def test_durability_policy_modes_coalesce_fsyncs(workspace, monkeypatch, mode, after_first, after_second, after_flush):
+    policy = workspace_module.DurabilityPolicy(mode, window_seconds=60, window_bytes=8)
+    monkeypatch.setattr(workspace_module, "WORKSPACE_DURABILITY", policy)
+    synced = []
+    monkeypatch.setattr(workspace_module.os, "fsync", synced.append)
+    (workspace.root / "a.txt").write_text("a", encoding="utf-8")
+
+    workspace.atomic_write("a.txt", "four", expected=workspace.inspect("a.txt"))
+    assert len(synced) == after_first
+    assert (workspace.root / "a.txt").read_text(encoding="utf-8") == "four"
+
+    workspace.atomic_create("b.txt", "more")
+    assert len(synced) == after_second
+    policy.flush()
+    assert len(synced) == after_flush
+
+
+def test_group_durability_flushes_a_quiet_window_at_its_deadline(workspace, monkeypatch):
+    from core.config import Config
+
+    monkeypatch.setenv("WORKSPACE_DURABILITY", " Group ")
+    policy = workspace_module.DurabilityPolicy(window_seconds=0.01)
+    policy.set_mode(Config.from_env().workspace_durability)
+    monkeypatch.setattr(workspace_module, "WORKSPACE_DURABILITY", policy)
+    flushed = threading.Event()
+    monkeypatch.setattr(workspace_module.os, "fsync", lambda _fd: flushed.set())
+    (workspace.root / "a.txt").write_text("a", encoding="utf-8")
+
+    workspace.atomic_write("a.txt", "no later write", expected=workspace.inspect("a.txt"))
+
+    assert policy.mode == "group"
+    assert flushed.wait(timeout=5)
+    policy.set_mode("unknown")
+    assert policy.mode == "always"
@@ -2,12 +2,14 @@
 
 from __future__ import annotations
 
+import itertools
 import os
 import re
-from collections.abc import Iterator
+from collections.abc import Iterable, Iterator
+from functools import lru_cache
 from pathlib import Path
 
-from tools.workspace import FileWorkspace, WorkspaceError
+from tools.workspace import FileIndex, FileWorkspace, WorkspaceError
 
 
 DEFAULT_IGNORED_NAMES = frozenset(
@@ -53,33 +55,54 @@ def visible_name(name: str, *, include_hidden: bool, include_ignored: bool) -> b
 
 
 def iter_files(
-    root: Path, *, include_hidden: bool = False, include_ignored: bool = False
+    root: Path, *, include_hidden: bool = False, include_ignored: bool = False,
+    index: FileIndex | None = None, prefix: tuple[str, ...] = (), max_depth: int | None = None,
 ) -> Iterator[Path]:
-    """Yield ordinary files below ``root`` in deterministic path order."""
-    for directory, directories, filenames in os.walk(root, topdown=True, followlinks=False):
-        current = Path(directory)
-        directories[:] = [
-            name
-            for name in sorted(directories)
-            if visible_name(
-                name, include_hidden=include_hidden, include_ignored=include_ignored
-            )
-            and not (current / name).is_symlink()
-        ]
-        for name in sorted(filenames):
-            candidate = current / name
-            if (
-                visible_name(name, include_hidden=include_hidden, include_ignored=include_ignored)
-                and not candidate.is_symlink()
-            ):
-                yield candidate
-
-
-def path_matches(path: str, pattern: str) -> bool:
-    """Match a relative POSIX path without letting ``*`` cross a directory."""
+    """Yield ordinary files below ``root`` in path order, pruned by ``glob_prefix``/``glob_depth`` limits."""
+    index, pending = index or FileIndex(), [(root, 0)]
+    while pending:
+        current, depth = pending.pop()
+        directories, files = index.listing(current)
+        for name, _size, _mtime_ns in files:
+            if visible_name(name, include_hidden=include_hidden, include_ignored=include_ignored):
+                yield current / name
+        pending.extend(
+            (current / name, depth + 1)
+            for name in reversed(directories)
+            if visible_name(name, include_hidden=include_hidden, include_ignored=include_ignored)
+            and (max_depth is None or depth < max_depth)
+            and (depth >= len(prefix) or compile_glob(prefix[depth]).match(name))
+        )
+
+
+def _normalize_glob(pattern: str) -> str:
     pattern = pattern.replace("\\", "/").lstrip("/")
     while pattern.startswith("./"):
         pattern = pattern[2:]
+    return pattern
+
+
+def glob_prefix(pattern: str) -> tuple[str, ...]:
+    """Directory segments ahead of any ``**``; a walked directory must match its level's segment."""
+    return tuple(itertools.takewhile(lambda part: "**" not in part, _normalize_glob(pattern).split("/")[:-1]))
+
+
+def glob_depth(pattern: str) -> int | None:
+    """How many directories deep a match can sit; None when a ``**`` allows any depth."""
+    segments = _normalize_glob(pattern).split("/")
+    return None if any("**" in segment for segment in segments) else len(segments) - 1
+
+
+def filter_paths(pattern: str, paths: Iterable[Path], root: Path) -> Iterator[Path]:
+    """Lazily keep the ``paths`` under ``root`` whose relative POSIX form matches ``pattern``."""
+    match, offset = compile_glob(pattern).match, len(str(root).rstrip(os.sep)) + 1
+    return (path for path in paths if match(str(path)[offset:].replace(os.sep, "/")))
+
+
+@lru_cache(maxsize=256)
+def compile_glob(pattern: str) -> re.Pattern[str]:
+    """Compile a glob over relative POSIX paths without letting ``*`` cross a directory."""
+    pattern = _normalize_glob(pattern)
     expression: list[str] = ["^"]
     index = 0
     while index < len(pattern):
@@ -108,4 +131,4 @@ def path_matches(path: str, pattern: str) -> bool:
             expression.append(re.escape(char))
         index += 1
     expression.append("$")
-    return re.match("".join(expression), path) is not None
+    return re.compile("".join(expression))
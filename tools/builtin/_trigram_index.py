@@ -0,0 +1,102 @@
+"""Optional on-disk trigram index that narrows Grep candidates for literal-bearing patterns."""
+
+from __future__ import annotations
+
+import contextlib
+import json
+import os
+import re
+import threading
+from collections.abc import Iterable
+from pathlib import Path
+
+from ..observation_store import ObservationTruncator
+
+_WORD = re.compile(r"\w{3,}")
+_INDEXES: dict[Path, "TrigramIndex"] = {}
+_INDEXES_LOCK = threading.Lock()
+
+
+def _trigrams(text: str) -> set[str]:
+    # Only trigrams inside word runs are indexed, so any literal word run of a match is covered.
+    return {word[i : i + 3] for word in set(_WORD.findall(text.casefold())) for i in range(len(word) - 2)}
+
+
+def required_trigrams(pattern: str) -> set[str]:
+    """Trigrams every match must contain; empty when the pattern is too rich to tell."""
+    if any(char in pattern for char in "|\\[({"):
+        return set()
+    # A character followed by ``?``/``*`` is optional; ``+`` and the rest only break literal runs.
+    return _trigrams(re.sub(r"[.^$+]", " ", re.sub(r".[?*]", " ", pattern)))
+
+
+class TrigramIndex:
+    """Casefolded per-file trigram sets, refreshed by size and mtime and journaled as JSON lines."""
+
+    def __init__(self, path: Path) -> None:
+        self.path, self._lock, self._journaled = path, threading.Lock(), 0
+        self._files: dict[str, tuple[int, int, frozenset[str]]] = {}
+        with contextlib.suppress(OSError), path.open(encoding="utf-8") as journal:
+            for line in journal:
+                try:
+                    key, mtime_ns, size, packed = json.loads(line)
+                except ValueError:
+                    continue  # an append cut short by a crash
+                grams = frozenset(packed[i : i + 3] for i in range(0, len(packed), 3))
+                self._files[key] = (mtime_ns, size, grams)
+                self._journaled += 1
+
+    def narrow(self, candidates: Iterable[Path], required: set[str]) -> list[Path]:
+        """Keep candidates whose indexed trigrams include ``required``, indexing changed files."""
+        kept: list[Path] = []
+        with self._lock:
+            changed: list[str] = []
+            for candidate in candidates:
+                try:
+                    file_stat = candidate.stat()
+                    stamp = (file_stat.st_mtime_ns, file_stat.st_size)
+                    entry = self._files.get(str(candidate))
+                    if entry is None or entry[:2] != stamp:
+                        entry = self._files[str(candidate)] = (*stamp, frozenset(_file_trigrams(candidate)))
+                        changed.append(str(candidate))
+                except OSError:
+                    continue
+                if required <= entry[2]:
+                    kept.append(candidate)
+            if changed:
+                self._save(changed)
+        return kept
+
+    def _save(self, changed: list[str]) -> None:
+        """Append changed entries; rewrite the journal once superseded lines outnumber live ones."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        compact = self._journaled + len(changed) > 2 * len(self._files)
+        keys = self._files if compact else changed
+        rows = ([key, *self._files[key][:2], "".join(sorted(self._files[key][2]))] for key in keys)
+        text = "".join(json.dumps(row) + "\n" for row in rows)
+        if compact:
+            temporary = self.path.with_suffix(".tmp")
+            temporary.write_text(text, encoding="utf-8")
+            os.replace(temporary, self.path)
+        else:
+            with self.path.open("a", encoding="utf-8") as journal:
+                journal.write(text)
+        self._journaled = len(self._files) if compact else self._journaled + len(changed)
+
+
+def _file_trigrams(path: Path) -> set[str]:
+    with path.open("rb") as handle:
+        head = handle.read(8192)
+        # Grep never searches files with a NUL in their head, so they index as empty and never survive.
+        return set() if b"\0" in head else _trigrams((head + handle.read()).decode("utf-8", errors="replace"))
+
+
+def trigram_index_for(root: Path) -> TrigramIndex | None:
+    """The process-wide index for ``root``, or None unless ``GREP_TRIGRAM_INDEX`` is enabled."""
+    if os.getenv("GREP_TRIGRAM_INDEX", "false").strip().lower() not in {"1", "true", "yes", "y", "on"}:
+        return None
+    with _INDEXES_LOCK:
+        if root not in _INDEXES:
+            # Kept beside spilled tool output, dot-named so Glob/Grep skip it like any hidden file.
+            _INDEXES[root] = TrigramIndex(ObservationTruncator(str(root)).output_dir / ".grep-trigrams.jsonl")
+        return _INDEXES[root]
@@ -4,20 +4,83 @@
 在项目根目录沙箱内执行 Shell 命令，支持命令串联与受限 cd。
 """
 
+import codecs
 import os
 import re
 import subprocess
+import threading
 import time
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Set
+from typing import IO, Any, Callable, Dict, List, Optional, Set, Tuple
 
 from prompts.tools_prompts.bash_prompt import bash_prompt
 from ..base import Tool, ToolParameter, ToolResult, ErrorCode
+from ..observation_store import ObservationTruncator
 from core.env import load_env
 
 load_env()
 
 
+# UTF-8 continuation bytes; a tail cut mid-character starts with up to three of them.
+_CONTINUATION_BYTES = bytes(range(0x80, 0xC0))
+
+
+class _StreamCapture:
+    """Bounded head and tail of one stream, overflow spilled to a file; updated only under ``_lock``."""
+
+    def __init__(self, spill_path: Callable[[], Path], limit: int = 32 * 1024) -> None:
+        self._new_spill_path, self.limit, self._lock = spill_path, limit, threading.Lock()
+        self.head, self.tail, self.total, self._closed = bytearray(), bytearray(), 0, False
+        self.spill_path: Optional[Path] = None
+        self._spill: Optional[IO[bytes]] = None
+
+    def drain(self, pipe: IO[bytes]) -> None:
+        with pipe:
+            for chunk in iter(lambda: pipe.read1(65536), b""):
+                with self._lock:
+                    if self._closed:
+                        break
+                    self.total += len(chunk)
+                    if self.total - len(chunk) <= 2 * self.limit < self.total:
+                        try:
+                            self.spill_path = self._new_spill_path()
+                            self._spill = open(self.spill_path, "wb")
+                            self._spill.write(self.head + self.tail)
+                        except OSError:
+                            self._spill = self.spill_path = None
+                    if self._spill is not None:
+                        self._spill.write(chunk)
+                    room = max(self.limit - len(self.head), 0)
+                    self.head += chunk[:room]
+                    self.tail += chunk[room:]
+                    del self.tail[: -self.limit]
+        with self._lock:
+            self._close()
+
+    def _close(self) -> None:
+        """Stop capturing and close the spill file; the caller holds ``_lock``."""
+        self._closed = True
+        if self._spill is not None:
+            self._spill.close()
+            self._spill = None
+
+    def snapshot(self, root: Path) -> Tuple[str, int, bool]:
+        """End the capture and return ``(text, total bytes, truncated)``, decoding whole characters."""
+        with self._lock:
+            self._close()
+            head, tail, total = bytes(self.head), bytes(self.tail), self.total
+        omitted = total - len(head) - len(tail)
+        if not omitted:
+            return (head + tail).decode("utf-8", errors="replace"), total, False
+        # The incremental decoder holds back a character the head cut in two; the tail drops its orphans.
+        head_text = codecs.getincrementaldecoder("utf-8")(errors="replace").decode(head)
+        tail = tail[:3].lstrip(_CONTINUATION_BYTES) + tail[3:]
+        saved = self.spill_path.relative_to(root.resolve()) if self.spill_path else None
+        where = f"full output: {saved}" if saved else "full output not saved"
+        marker = f"\n... ({omitted} bytes omitted; {where}) ...\n"
+        return head_text + marker + tail.decode("utf-8", errors="replace"), total, True
+
+
 class BashTool(Tool):
     """Shell 命令执行工具，支持命令串联与沙箱限制"""
 
@@ -27,6 +90,9 @@ class BashTool(Tool):
     # 最大超时时间（毫秒）
     MAX_TIMEOUT_MS = 600000
 
+    # 命令结束或被杀后，留给已缓冲输出读完的最短时间（秒）
+    DRAIN_GRACE_SECONDS = 0.1
+
     # 交互式命令黑名单（直接拒绝）
     INTERACTIVE_COMMANDS: Set[str] = {
         "vim", "vi", "nano", "less", "more", "top", "htop",
@@ -43,9 +109,10 @@ class BashTool(Tool):
         "sudo", "su", "doas",
     }
     
-    # 读/搜/列类 Shell 命令黑名单（应使用相应工具）
-    READ_SEARCH_COMMANDS: Set[str] = {
-        "ls", "cat", "head", "tail", "grep", "find", "rg",
+    # 读/搜/列类 Shell 命令黑名单 -> 应使用的相应工具
+    READ_SEARCH_COMMANDS: Dict[str, str] = {
+        "ls": "Glob", "find": "Glob", "cat": "Read", "head": "Read", "tail": "Read",
+        "grep": "Grep", "rg": "Grep",
     }
 
     def __init__(
@@ -105,27 +172,16 @@ class BashTool(Tool):
         
         # command 必填
         if not command:
-            return self.error_result(
-                error_code=ErrorCode.INVALID_PARAM,
-                message="Missing required parameter 'command'.",
-                params_input=params_input,
-            )
+            return self._reject(ErrorCode.INVALID_PARAM, "Missing required parameter 'command'.", params_input)
         
         # command 必须是字符串
         if not isinstance(command, str):
-            return self.error_result(
-                error_code=ErrorCode.INVALID_PARAM,
-                message="Parameter 'command' must be a string.",
-                params_input=params_input,
-            )
+            return self._reject(ErrorCode.INVALID_PARAM, "Parameter 'command' must be a string.", params_input)
         
         # timeout_ms 校验
         if not isinstance(timeout_ms, int) or timeout_ms < 1 or timeout_ms > self.MAX_TIMEOUT_MS:
-            return self.error_result(
-                error_code=ErrorCode.INVALID_PARAM,
-                message=f"timeout_ms must be an integer between 1 and {self.MAX_TIMEOUT_MS}.",
-                params_input=params_input,
-            )
+            message = f"timeout_ms must be an integer between 1 and {self.MAX_TIMEOUT_MS}."
+            return self._reject(ErrorCode.INVALID_PARAM, message, params_input)
 
         # =====================================================================
         # 安全检查：命令黑名单
@@ -133,11 +189,7 @@ class BashTool(Tool):
         
         safety_result = self._check_command_safety(command)
         if safety_result is not None:
-            return self.error_result(
-                error_code=ErrorCode.INVALID_PARAM,
-                message=safety_result,
-                params_input=params_input,
-            )
+            return self._reject(ErrorCode.INVALID_PARAM, safety_result, params_input)
 
         # =====================================================================
         # 目录解析与沙箱校验
@@ -157,33 +209,17 @@ class BashTool(Tool):
             if not directory_resolved:
                 directory_resolved = "."
         except ValueError:
-            return self.error_result(
-                error_code=ErrorCode.ACCESS_DENIED,
-                message="Access denied. Path must be within project root.",
-                params_input=params_input,
-            )
+            return self._reject(ErrorCode.ACCESS_DENIED, "Access denied. Path must be within project root.", params_input)
         except OSError as e:
-            return self.error_result(
-                error_code=ErrorCode.INTERNAL_ERROR,
-                message=f"Path resolution failed: {e}",
-                params_input=params_input,
-            )
+            return self._reject(ErrorCode.INTERNAL_ERROR, f"Path resolution failed: {e}", params_input)
         
         # 检查目录是否存在
         if not target_dir.exists():
-            return self.error_result(
-                error_code=ErrorCode.NOT_FOUND,
-                message=f"Directory '{directory}' does not exist.",
-                params_input=params_input,
-            )
+            return self._reject(ErrorCode.NOT_FOUND, f"Directory '{directory}' does not exist.", params_input)
         
         # 检查是否为目录
         if not target_dir.is_dir():
-            return self.error_result(
-                error_code=ErrorCode.INVALID_PARAM,
-                message=f"'{directory}' is not a directory.",
-                params_input=params_input,
-            )
+            return self._reject(ErrorCode.INVALID_PARAM, f"'{directory}' is not a directory.", params_input)
 
         # =====================================================================
         # 检查命令中的 cd 路径
@@ -191,11 +227,7 @@ class BashTool(Tool):
         
         cd_check_result = self._check_cd_paths(command, target_dir)
         if cd_check_result is not None:
-            return self.error_result(
-                error_code=ErrorCode.ACCESS_DENIED,
-                message=cd_check_result,
-                params_input=params_input,
-            )
+            return self._reject(ErrorCode.ACCESS_DENIED, cd_check_result, params_input)
 
         # =====================================================================
         # 执行命令
@@ -207,56 +239,26 @@ class BashTool(Tool):
         
         # 转换超时时间为秒
         timeout_sec = timeout_ms / 1000.0
-        
-        stdout = ""
-        stderr = ""
-        exit_code = None
         signal_name = None
-        timed_out = False
         
         try:
-            result = subprocess.run(
-                command,
-                shell=True,
-                cwd=str(target_dir),
-                env=env,
-                capture_output=True,
-                text=True,
-                timeout=timeout_sec,
-            )
-            stdout = result.stdout
-            stderr = result.stderr
-            exit_code = result.returncode
-        except subprocess.TimeoutExpired as e:
-            timed_out = True
-            stdout = e.stdout or ""
-            stderr = e.stderr or ""
-            if isinstance(stdout, bytes):
-                stdout = stdout.decode("utf-8", errors="replace")
-            if isinstance(stderr, bytes):
-                stderr = stderr.decode("utf-8", errors="replace")
+            *captures, exit_code, timed_out, incomplete = self._stream(command, target_dir, env, timeout_sec)
         except PermissionError:
             time_ms = int((time.monotonic() - start_time) * 1000)
-            return self.error_result(
-                error_code=ErrorCode.PERMISSION_DENIED,
-                message="Permission denied executing command.",
-                params_input=params_input,
-                time_ms=time_ms,
-            )
+            message = "Permission denied executing command."
+            return self._reject(ErrorCode.PERMISSION_DENIED, message, params_input, time_ms=time_ms)
         except Exception as e:
             time_ms = int((time.monotonic() - start_time) * 1000)
-            return self.error_result(
-                error_code=ErrorCode.EXECUTION_ERROR,
-                message=f"Command failed: {e}",
-                params_input=params_input,
-                time_ms=time_ms,
-            )
+            return self._reject(ErrorCode.EXECUTION_ERROR, f"Command failed: {e}", params_input, time_ms=time_ms)
 
         # =====================================================================
         # 构建响应
         # =====================================================================
         
         time_ms = int((time.monotonic() - start_time) * 1000)
+        (stdout, stdout_bytes, stdout_cut), (stderr, stderr_bytes, stderr_cut) = (
+            capture.snapshot(self._root) for capture in captures
+        )
         
         # 构建 data 字段
         data: Dict[str, Any] = {
@@ -264,16 +266,13 @@ class BashTool(Tool):
             "stderr": stderr,
             "exit_code": exit_code,
             "signal": signal_name,
-            "truncated": False,  # MVP 阶段不截断
+            "truncated": stdout_cut or stderr_cut or incomplete,
             "command": command,
             "directory": directory_resolved,
         }
         
-        # 构建 stats 字段
-        extra_stats = {
-            "stdout_bytes": len(stdout.encode("utf-8")),
-            "stderr_bytes": len(stderr.encode("utf-8")),
-        }
+        # 构建 stats 字段（字节数在读取时累计，不再重新编码）
+        extra_stats = {"stdout_bytes": stdout_bytes, "stderr_bytes": stderr_bytes}
         
         # 构建 context 字段
         extra_context = {
@@ -283,82 +282,68 @@ class BashTool(Tool):
         
         # 构建 text 字段
         if timed_out:
-            if stdout or stderr:
-                # 超时但有部分输出 -> partial
-                text_lines = [
-                    f"Command timed out: {command}",
-                    f"(Timeout after {timeout_ms}ms)",
-                ]
-                if stdout:
-                    text_lines.append(f"\n--- STDOUT ({len(stdout.encode('utf-8'))} bytes) ---")
-                    text_lines.append(stdout[:1000] + ("..." if len(stdout) > 1000 else ""))
-                if stderr:
-                    text_lines.append(f"\n--- STDERR ({len(stderr.encode('utf-8'))} bytes) ---")
-                    text_lines.append(stderr[:1000] + ("..." if len(stderr) > 1000 else ""))
-                text = "\n".join(text_lines)
-                
-                return self.partial_result(
-                    data=data,
-                    text=text,
-                    params_input=params_input,
-                    time_ms=time_ms,
-                    extra_stats=extra_stats,
-                    extra_context=extra_context,
-                )
-            else:
+            if not stdout and not stderr:
                 # 超时且无输出 -> error
-                return self.error_result(
-                    error_code=ErrorCode.TIMEOUT,
-                    message="Command timed out with no output.",
-                    params_input=params_input,
-                    time_ms=time_ms,
-                )
-        
-        # 判断状态
-        if exit_code == 0:
-            # 成功
-            text_lines = [
-                f"Command succeeded: {command}",
-                f"(Exit code 0. Took {time_ms}ms)",
-            ]
-            if stdout:
-                text_lines.append(f"\n--- STDOUT ({len(stdout.encode('utf-8'))} bytes) ---")
-                text_lines.append(stdout[:2000] + ("..." if len(stdout) > 2000 else ""))
-            if stderr:
-                text_lines.append(f"\n--- STDERR ({len(stderr.encode('utf-8'))} bytes) ---")
-                text_lines.append(stderr[:1000] + ("..." if len(stderr) > 1000 else ""))
-            text = "\n".join(text_lines)
-            
-            return self.success_result(
-                data=data,
-                text=text,
-                params_input=params_input,
-                time_ms=time_ms,
-                extra_stats=extra_stats,
-                extra_context=extra_context,
-            )
+                return self._reject(ErrorCode.TIMEOUT, "Command timed out with no output.", params_input, time_ms=time_ms)
+            # 超时但有部分输出 -> partial
+            text_lines = [f"Command timed out: {command}", f"(Timeout after {timeout_ms}ms)"]
+            previews = (1000, 1000)
+        elif exit_code == 0:
+            text_lines = [f"Command succeeded: {command}", f"(Exit code 0. Took {time_ms}ms)"]
+            previews = (2000, 1000)
         else:
             # 非零退出码 -> partial
-            text_lines = [
-                f"Command failed: {command}",
-                f"(Exit code {exit_code}. Took {time_ms}ms)",
-            ]
-            if stdout:
-                text_lines.append(f"\n--- STDOUT ({len(stdout.encode('utf-8'))} bytes) ---")
-                text_lines.append(stdout[:2000] + ("..." if len(stdout) > 2000 else ""))
-            if stderr:
-                text_lines.append(f"\n--- STDERR ({len(stderr.encode('utf-8'))} bytes) ---")
-                text_lines.append(stderr[:2000] + ("..." if len(stderr) > 2000 else ""))
-            text = "\n".join(text_lines)
-            
-            return self.partial_result(
-                data=data,
-                text=text,
-                params_input=params_input,
-                time_ms=time_ms,
-                extra_stats=extra_stats,
-                extra_context=extra_context,
-            )
+            text_lines = [f"Command failed: {command}", f"(Exit code {exit_code}. Took {time_ms}ms)"]
+            previews = (2000, 2000)
+        if incomplete:
+            text_lines.append("(Output incomplete: a background process held the pipes past the timeout.)")
+        for label, output, size, preview in (
+            ("STDOUT", stdout, stdout_bytes, previews[0]),
+            ("STDERR", stderr, stderr_bytes, previews[1]),
+        ):
+            if output:
+                text_lines.append(f"\n--- {label} ({size} bytes) ---")
+                text_lines.append(output[:preview] + ("..." if len(output) > preview else ""))
+        
+        succeeded = exit_code == 0 and not timed_out and not incomplete
+        response = self.success_result if succeeded else self.partial_result
+        return response(
+            data=data,
+            text="\n".join(text_lines),
+            params_input=params_input,
+            time_ms=time_ms,
+            extra_stats=extra_stats,
+            extra_context=extra_context,
+        )
+
+    def _reject(self, code: ErrorCode, message: str, params_input: Dict[str, Any], **extra: Any) -> ToolResult:
+        return self.error_result(error_code=code, message=message, params_input=params_input, **extra)
+
+    def _stream(
+        self, command: str, cwd: Path, env: Dict[str, str], timeout_sec: float
+    ) -> Tuple["_StreamCapture", "_StreamCapture", Optional[int], bool, bool]:
+        """Run the command into two bounded captures; the last flag means a reader outlived the deadline."""
+        deadline, spill = time.monotonic() + timeout_sec, ObservationTruncator(str(self._root)).spill_path
+        captures = [_StreamCapture(lambda name=name: spill(self.name, name)) for name in ("stdout", "stderr")]
+        process = subprocess.Popen(
+            command, shell=True, cwd=str(cwd), env=env, stdout=subprocess.PIPE, stderr=subprocess.PIPE
+        )
+        readers = [
+            threading.Thread(target=capture.drain, args=(pipe,), daemon=True)
+            for capture, pipe in zip(captures, (process.stdout, process.stderr))
+        ]
+        for reader in readers:
+            reader.start()
+        try:
+            exit_code, timed_out = process.wait(timeout=timeout_sec), False
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+            exit_code, timed_out = None, True
+        for reader in readers:
+            # A background child may hold a pipe open after the shell exits; never wait past the deadline.
+            reader.join(timeout=max(deadline - time.monotonic(), self.DRAIN_GRACE_SECONDS))
+        return (*captures, exit_code, timed_out, any(reader.is_alive() for reader in readers))
 
     def _check_command_safety(self, command: str) -> Optional[str]:
         """
@@ -388,15 +373,14 @@ class BashTool(Tool):
             if "add" in words and ("-i" in command or "--interactive" in command):
                 return "Command blocked by safety rules. Interactive 'git add -i' is not allowed."
         
-        # 检查破坏性命令
-        for word in words:
-            if word in self.DESTRUCTIVE_COMMANDS:
-                return f"Command blocked by safety rules. Destructive command '{word}' is not allowed."
-        
-        # 检查权限提升命令
-        for word in words:
-            if word in self.PRIVILEGE_COMMANDS:
-                return f"Command blocked by safety rules. Privilege escalation command '{word}' is not allowed."
+        # 检查破坏性命令与权限提升命令
+        for kind, commands in (
+            ("Destructive", self.DESTRUCTIVE_COMMANDS),
+            ("Privilege escalation", self.PRIVILEGE_COMMANDS),
+        ):
+            blocked = next((word for word in words if word in commands), None)
+            if blocked is not None:
+                return f"Command blocked by safety rules. {kind} command '{blocked}' is not allowed."
         
         # 检查危险的 rm 命令
         if "rm" in words:
@@ -429,16 +413,8 @@ class BashTool(Tool):
         # 检查读/搜/列类命令
         for word in words:
             if word in self.READ_SEARCH_COMMANDS:
-                tool_suggestion = {
-                    "ls": "Glob",
-                    "cat": "Read",
-                    "head": "Read",
-                    "tail": "Read",
-                    "grep": "Grep",
-                    "find": "Glob",
-                    "rg": "Grep",
-                }.get(word, "the appropriate tool")
-                return f"Command blocked by safety rules. Use {tool_suggestion} instead of '{word}'."
+                suggestion = self.READ_SEARCH_COMMANDS[word]
+                return f"Command blocked by safety rules. Use {suggestion} instead of '{word}'."
         
         return None
 
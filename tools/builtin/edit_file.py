@@ -3,6 +3,9 @@
 from __future__ import annotations
 
 import difflib
+import itertools
+import os
+import re
 import time
 from pathlib import Path
 from typing import Any, Optional
@@ -17,6 +20,8 @@ class EditTool(Tool):
 
     MAX_DIFF_LINES = 100
     MAX_DIFF_BYTES = 10_240
+    # Larger windows skip difflib, whose cost can grow quadratically with repetitive lines.
+    MAX_DIFF_WINDOW_CHARS = 65_536
 
     def __init__(
         self,
@@ -40,22 +45,28 @@ class EditTool(Tool):
         path = parameters.get("path")
         edits = parameters.get("edits")
         create_content = parameters.get("create_content")
+        batch = parameters.get("batch")
         dry_run = parameters.get("dry_run", False)
 
         validation = self._validate(path, edits, create_content, dry_run, params_input)
+        if validation is None and batch is not None:
+            validation = self._validate_batch(batch, create_content, dry_run, params_input)
         if validation is not None:
             return validation
-        try:
-            target = self._workspace.resolve(path)
-        except WorkspaceError as error:
-            return self._workspace_error_response(error, path, params_input)
-        rel_path = self._workspace.relative(target)
-
         if create_content is not None:
-            return self._create(
-                path, rel_path, create_content, dry_run, params_input, started
-            )
-        return self._edit(path, rel_path, edits, dry_run, params_input, started)
+            return self._create(path, create_content, dry_run, params_input, started)
+        entries = [params_input, *(batch or [])]
+        changes: list[tuple[str, str, str, str, list[tuple[int, int, str]], Any]] = []
+        for entry in entries:
+            change = self._edit(entry, params_input)
+            if isinstance(change, ToolResult):
+                return change
+            if any(change[1] == seen[1] for seen in changes):
+                message = f"File '{change[1]}' appears more than once; merge its edits into one entry."
+                return self._error(ErrorCode.INVALID_PARAM, message, params_input, path_resolved=change[1])
+            changes.append(change)
+        replacements = sum(len(entry["edits"]) for entry in entries)
+        return self._finish(changes, replacements, "edit", dry_run, params_input, started)
 
     def _validate(
         self,
@@ -101,132 +112,100 @@ class EditTool(Tool):
             return self._error(ErrorCode.INVALID_PARAM, "Parameter 'dry_run' must be a boolean.", params_input)
         return None
 
+    def _validate_batch(
+        self, batch: Any, create_content: Any, dry_run: Any, params_input: dict[str, Any]
+    ) -> Optional[ToolResult]:
+        """Check ``batch``: further ``{path, edits}`` files written in one all-or-nothing transaction."""
+        if create_content is not None or not isinstance(batch, list) or not batch:
+            message = "Parameter 'batch' must be a non-empty array used with 'edits'."
+            return self._error(ErrorCode.INVALID_PARAM, message, params_input)
+        for index, entry in enumerate(batch):
+            if not isinstance(entry, dict):
+                message = f"Batch entry at index {index} must be an object."
+                return self._error(ErrorCode.INVALID_PARAM, message, params_input)
+            error = self._validate(entry.get("path"), entry.get("edits"), None, dry_run, params_input)
+            if error is not None:
+                return error
+        return None
+
+    def _resolve(self, path: str, params_input: dict[str, Any]) -> str | ToolResult:
+        try:
+            return self._workspace.relative(self._workspace.resolve(path))
+        except WorkspaceError as error:
+            return self._workspace_error_response(error, path, params_input)
+
     def _create(
         self,
         path: str,
-        rel_path: str,
         content: str,
         dry_run: bool,
         params_input: dict[str, Any],
         started: float,
     ) -> ToolResult:
+        rel_path = self._resolve(path, params_input)
+        if isinstance(rel_path, ToolResult):
+            return rel_path
         try:
-            initial = self._workspace.inspect(path)
+            self._workspace.inspect(path)
         except WorkspaceError as error:
             if error.kind != "not_found":
                 return self._workspace_error_response(error, path, params_input, path_resolved=rel_path)
-            return self._finish(
-                path=path,
-                rel_path=rel_path,
-                old_content="",
-                new_content=content,
-                replacements=0,
-                operation="create",
-                dry_run=dry_run,
-                params_input=params_input,
-                started=started,
-                snapshot=None,
-            )
-        lock_error = self._validate_lock(params_input, rel_path)
-        if lock_error is not None:
-            return lock_error
-        if (
-            initial.mtime_ms != params_input["expected_mtime_ms"]
-            or initial.size != params_input["expected_size_bytes"]
-        ):
-            return self._error(
-                ErrorCode.CONFLICT,
-                "File has been modified since you read it. Please Read the file again.",
-                params_input,
-                path_resolved=rel_path,
-            )
-        try:
-            old_content, _encoding, _fallback, snapshot = self._workspace.read_text(path)
-        except WorkspaceError as error:
-            return self._workspace_error_response(error, path, params_input, path_resolved=rel_path)
-        return self._finish(
-            path=path,
-            rel_path=rel_path,
-            old_content=old_content,
-            new_content=content,
-            replacements=1,
-            operation="replace",
-            dry_run=dry_run,
-            params_input=params_input,
-            started=started,
-            snapshot=snapshot,
-        )
+            change = (path, rel_path, "", content, [(0, 0, content)], None)
+            return self._finish([change], 0, "create", dry_run, params_input, started)
+        old_content, snapshot, error = self._read_locked(path, rel_path, params_input, params_input)
+        if error is not None:
+            return error
+        change = (path, rel_path, old_content, content, [_changed_region(old_content, content)], snapshot)
+        return self._finish([change], 1, "replace", dry_run, params_input, started)
 
-    def _edit(
-        self,
-        path: str,
-        rel_path: str,
-        edits: list[dict[str, str]],
-        dry_run: bool,
-        params_input: dict[str, Any],
-        started: float,
-    ) -> ToolResult:
-        lock_error = self._validate_lock(params_input, rel_path)
-        if lock_error is not None:
-            return lock_error
-        try:
-            initial = self._workspace.inspect(path)
-        except WorkspaceError as error:
-            return self._workspace_error_response(error, path, params_input, path_resolved=rel_path)
-        expected_mtime = params_input.get("expected_mtime_ms")
-        expected_size = params_input.get("expected_size_bytes")
-        if initial.mtime_ms != expected_mtime or initial.size != expected_size:
-            return self._error(
-                ErrorCode.CONFLICT,
-                "File has been modified since you read it. Please Read the file again.",
-                params_input,
-                path_resolved=rel_path,
-            )
-        try:
-            old_content, _encoding, _fallback, snapshot = self._workspace.read_text(path)
-        except WorkspaceError as error:
-            return self._workspace_error_response(error, path, params_input, path_resolved=rel_path)
-        new_content, error = self._apply_edits(old_content, edits, params_input, rel_path)
+    def _edit(self, entry: dict[str, Any], params_input: dict[str, Any]) -> tuple[Any, ...] | ToolResult:
+        """Lock-check and edit one file in memory: ``(path, rel_path, old, new, regions, snapshot)``."""
+        path = entry["path"]
+        rel_path = self._resolve(path, params_input)
+        if isinstance(rel_path, ToolResult):
+            return rel_path
+        old_content, snapshot, error = self._read_locked(path, rel_path, entry, params_input)
         if error is not None:
             return error
-        return self._finish(
-            path=path,
-            rel_path=rel_path,
-            old_content=old_content,
-            new_content=new_content,
-            replacements=len(edits),
-            operation="edit",
-            dry_run=dry_run,
-            params_input=params_input,
-            started=started,
-            snapshot=snapshot,
-        )
+        new_content, regions, error = self._apply_edits(old_content, entry["edits"], params_input, rel_path)
+        if error is not None:
+            return error
+        return path, rel_path, old_content, new_content, regions, snapshot
 
-    def _validate_lock(self, params_input: dict[str, Any], rel_path: str) -> Optional[str]:
-        mtime = params_input.get("expected_mtime_ms")
-        size = params_input.get("expected_size_bytes")
+    def _read_locked(
+        self, path: str, rel_path: str, lock: dict[str, Any], params_input: dict[str, Any]
+    ) -> tuple[str, Any, Optional[ToolResult]]:
+        """Read the file once and check its snapshot against the ``lock`` injected after Read."""
+        mtime, size = lock.get("expected_mtime_ms"), lock.get("expected_size_bytes")
         if mtime is None and size is None:
-            return self._error(
+            return "", None, self._error(
                 ErrorCode.INVALID_PARAM,
                 "You must Read the file before editing it.",
                 params_input,
                 path_resolved=rel_path,
             )
         if mtime is None or size is None:
-            return self._error(
+            return "", None, self._error(
                 ErrorCode.INVALID_PARAM,
                 "Both expected_mtime_ms and expected_size_bytes must be provided together.",
                 params_input,
                 path_resolved=rel_path,
             )
         if not isinstance(mtime, int) or not isinstance(size, int):
-            return self._error(
+            return "", None, self._error(
                 ErrorCode.INVALID_PARAM,
                 "expected_mtime_ms and expected_size_bytes must be integers.",
                 params_input,
                 path_resolved=rel_path,
             )
-        return None
+        try:
+            old_content, _encoding, _fallback, snapshot = self._workspace.read_text(path)
+        except WorkspaceError as error:
+            return "", None, self._workspace_error_response(error, path, params_input, path_resolved=rel_path)
+        if (snapshot.mtime_ms, snapshot.size) != (mtime, size):
+            message = "File has been modified since you read it. Please Read the file again."
+            return "", None, self._error(ErrorCode.CONFLICT, message, params_input, path_resolved=rel_path)
+        return old_content, snapshot, None
 
     def _apply_edits(
         self,
@@ -234,92 +213,104 @@ class EditTool(Tool):
         edits: list[dict[str, str]],
         params_input: dict[str, Any],
         rel_path: str,
-    ) -> tuple[str, Optional[str]]:
+    ) -> tuple[str, list[tuple[int, int, str]], Optional[ToolResult]]:
+        """Apply every edit in one pass; regions are ``(start, end, new)`` in the LF-normalized original."""
         use_crlf = old_content.count("\r\n") > old_content.count("\n") - old_content.count("\r\n")
         normalized = old_content.replace("\r\n", "\n")
         regions: list[tuple[int, int, int, str]] = []
         for index, edit in enumerate(edits):
             old = edit["old_string"].replace("\r\n", "\n")
             new = edit["new_string"].replace("\r\n", "\n")
-            count = normalized.count(old)
-            if count != 1:
+            start = normalized.find(old)
+            # Resuming after the first hit finishes the single pass that proves uniqueness.
+            if start < 0 or normalized.find(old, start + len(old)) >= 0:
+                count = normalized.count(old)
                 noun = "not found" if count == 0 else f"matches {count} times"
-                return old_content, self._error(
+                return old_content, [], self._error(
                     ErrorCode.INVALID_PARAM,
                     f"Edit at index {index}: old_string {noun}; it must be unique.",
                     params_input,
                     path_resolved=rel_path,
                     data={"failed_index": index},
                 )
-            start = normalized.find(old)
             regions.append((start, start + len(old), index, new))
-        for previous, following in zip(sorted(regions), sorted(regions)[1:]):
-            if following[0] < previous[1]:
-                return old_content, self._error(
+        regions.sort()
+        pieces: list[str] = []
+        position = 0
+        for previous, (start, end, index, new) in zip([None, *regions], regions):
+            if previous is not None and start < previous[1]:
+                return old_content, [], self._error(
                     ErrorCode.INVALID_PARAM,
-                    f"Edits at indexes {previous[2]} and {following[2]} overlap.",
+                    f"Edits at indexes {previous[2]} and {index} overlap.",
                     params_input,
                     path_resolved=rel_path,
                 )
-        for start, end, _index, new in reversed(sorted(regions)):
-            normalized = normalized[:start] + new + normalized[end:]
-        return (normalized.replace("\n", "\r\n") if use_crlf else normalized), None
+            pieces += (normalized[position:start], new)
+            position = end
+        edited = "".join(pieces) + normalized[position:]
+        spans = [(start, end, new) for start, end, _index, new in regions]
+        return (edited.replace("\n", "\r\n") if use_crlf else edited), spans, None
 
     def _finish(
-        self,
-        *,
-        path: str,
-        rel_path: str,
-        old_content: str,
-        new_content: str,
-        replacements: int,
-        operation: str,
-        dry_run: bool,
-        params_input: dict[str, Any],
-        started: float,
-        snapshot: Any,
+        self, changes: list[tuple[str, str, str, str, list[tuple[int, int, str]], Any]], replacements: int,
+        operation: str, dry_run: bool, params_input: dict[str, Any], started: float,
     ) -> ToolResult:
-        diff = self._compute_diff(old_content, new_content, rel_path)
+        """Write every ``(path, rel_path, old, new, regions, snapshot)`` change, several as one batch."""
+        # Edit regions index the LF-normalized text even for a CRLF file.
+        normalize = operation == "edit"
+        diffs = [
+            self._compute_diff(old.replace("\r\n", "\n") if normalize else old, regions, rel, len(changes))
+            for _path, rel, old, _new, regions, _snapshot in changes
+        ]
+        path, rel_path, _old, new_content, _regions, snapshot = changes[0]
         applied = False
         try:
-            if not dry_run:
-                if snapshot is None:
-                    bytes_written = self._workspace.atomic_create(path, new_content)
-                else:
-                    bytes_written = self._workspace.atomic_write(path, new_content, expected=snapshot)
-                applied = True
+            if dry_run:
+                bytes_written = sum(len(change[3].encode("utf-8")) for change in changes)
+            elif snapshot is None:
+                bytes_written = self._workspace.atomic_create(path, new_content)
+            elif len(changes) == 1:
+                bytes_written = self._workspace.atomic_write(path, new_content, expected=snapshot)
             else:
-                bytes_written = len(new_content.encode("utf-8"))
+                writes = [(change[0], change[3], change[5]) for change in changes]
+                bytes_written = sum(self._workspace.atomic_write_many(writes))
+            applied = not dry_run
         except WorkspaceError as error:
             return self._workspace_error_response(error, path, params_input, path_resolved=rel_path)
         except PermissionError:
             return self._error(ErrorCode.PERMISSION_DENIED, "Permission denied writing to file.", params_input, path_resolved=rel_path)
         except OSError as error:
             return self._error(ErrorCode.EXECUTION_ERROR, f"Disk full or IO error: {error}", params_input, path_resolved=rel_path)
+        truncated = any(diff["truncated"] for diff in diffs)
+        added, removed = (sum(diff[key] for diff in diffs) for key in ("lines_added", "lines_removed"))
         data = {
             "applied": applied,
             "operation": operation,
             "replacements": replacements,
-            "diff_preview": diff["preview"],
-            "diff_truncated": diff["truncated"],
+            "diff_preview": "\n".join(diff["preview"] for diff in diffs),
+            "diff_truncated": truncated,
         }
+        if len(changes) > 1:
+            data["files"] = [change[1] for change in changes]
         if dry_run:
             data["dry_run"] = True
         stats = {
             "bytes_written": bytes_written,
-            "original_size": len(old_content.encode("utf-8")),
-            "new_size": len(new_content.encode("utf-8")),
-            "lines_added": diff["lines_added"],
-            "lines_removed": diff["lines_removed"],
+            "original_size": sum(len(change[2].encode("utf-8")) for change in changes),
+            "new_size": sum(len(change[3].encode("utf-8")) for change in changes),
+            "lines_added": added,
+            "lines_removed": removed,
         }
+        lines = f"+{added}/-{removed} lines"
+        target = f"'{rel_path}'" if len(changes) == 1 else f"{len(changes)} files"
         text = (
-            f"[Dry Run] Would {operation} '{rel_path}' (+{diff['lines_added']}/-{diff['lines_removed']} lines)."
+            f"[Dry Run] Would {operation} {target} ({lines})."
             if dry_run
-            else f"{operation.capitalize()}d '{rel_path}' (+{diff['lines_added']}/-{diff['lines_removed']} lines, {bytes_written} bytes)."
+            else f"{operation.capitalize()}d {target} ({lines}, {bytes_written} bytes)."
         )
-        if diff["truncated"]:
+        if truncated:
             text += "\n(Diff preview truncated. Use Read to verify full content.)"
-        response = self.partial_result if dry_run or diff["truncated"] else self.success_result
+        response = self.partial_result if dry_run or truncated else self.success_result
         return response(
             data=data,
             text=text,
@@ -375,39 +366,85 @@ class EditTool(Tool):
             path_resolved=path_resolved,
         )
 
-    def _compute_diff(self, old_content: str, new_content: str, path: str) -> dict[str, Any]:
-        preview: list[str] = []
-        preview_bytes = 0
-        truncated = False
+    def _compute_diff(
+        self, old: str, regions: list[tuple[int, int, str]], path: str, share: int = 1
+    ) -> dict[str, Any]:
+        """Diff the lines around each region, numbered as in the file, within its ``share`` of the budget."""
+        max_rows, max_bytes = self.MAX_DIFF_LINES // share, self.MAX_DIFF_BYTES // share
         added = removed = 0
-        for line in difflib.unified_diff(
-            old_content.splitlines(keepends=True),
-            new_content.splitlines(keepends=True),
-            fromfile=f"a/{path}",
-            tofile=f"b/{path}",
-            lineterm="\n",
-        ):
-            if line.startswith("+") and not line.startswith("+++"):
-                added += 1
-            elif line.startswith("-") and not line.startswith("---"):
-                removed += 1
-            display = line[0] + line[1:].lstrip() if line[:1] in {"+", "-"} and not line.startswith(("+++", "---")) else line
-            size = len(display.encode("utf-8"))
-            if len(preview) >= self.MAX_DIFF_LINES or preview_bytes + size > self.MAX_DIFF_BYTES:
-                truncated = True
+        for begin, stop, new in _windows(old, regions, 0):
+            removed += len(old[begin:stop].splitlines())
+            added += len(new.splitlines())
+        preview = [f"--- a/{path}\n", f"+++ b/{path}\n"]
+        preview_bytes, truncated, shift = len("".join(preview).encode("utf-8")), False, 0
+        for begin, stop, new in _windows(old, regions, 3):
+            line = old.count("\n", 0, begin)
+            old_count, new_count = len(old[begin:stop].splitlines()), len(new.splitlines())
+            if stop - begin + len(new) > self.MAX_DIFF_WINDOW_CHARS:
+                rows = [f"@@ -{min(old_count, 1)},{old_count} +{min(new_count, 1)},{new_count} @@\n"]
+                rows += [f"-{row}" for row in old[begin : min(stop, begin + max_bytes)].splitlines(True)]
+                rows += [f"+{row}" for row in new[:max_bytes].splitlines(True)]
+            else:
+                diff = difflib.unified_diff(old[begin:stop].splitlines(True), new.splitlines(True))
+                rows = itertools.islice(diff, 2, None)  # one ---/+++ header for the whole file
+            for row in rows:
+                if row.startswith("@@"):
+                    offsets = iter((line, line + shift))
+                    row = re.sub(r"(?<=[-+])\d+", lambda hit: str(int(hit[0]) + next(offsets)), row, count=2)
+                display = row[0] + row[1:].lstrip() if row[:1] in {"+", "-"} else row
+                size = len(display.encode("utf-8"))
+                if len(preview) >= max_rows or preview_bytes + size > max_bytes:
+                    truncated = True
+                    break
+                preview.append(display)
+                preview_bytes += size
+            if truncated:
+                preview.append("... (truncated)")
                 break
-            preview.append(display)
-            preview_bytes += size
-        if truncated:
-            preview.append("... (truncated)")
-        return {"preview": "\n".join(preview), "truncated": truncated, "lines_added": added, "lines_removed": removed}
+            shift += new_count - old_count
+        listing = "\n".join(preview) if len(preview) > 2 else ""
+        return {"preview": listing, "truncated": truncated, "lines_added": added, "lines_removed": removed}
 
     def get_parameters(self) -> list[ToolParameter]:
         return [
             ToolParameter(name="path", type="string", description="Path relative to project root.", required=True),
             ToolParameter(name="edits", type="array", description="Ordered unique replacements; use exactly one of edits or create_content.", required=False),
             ToolParameter(name="create_content", type="string", description="Content for a new file; use exactly one of edits or create_content.", required=False),
+            ToolParameter(
+                name="batch", type="array", required=False,
+                description="More {path, edits} files written with this one, all or none.",
+            ),
             ToolParameter(name="expected_mtime_ms", type="integer", description="Read snapshot mtime, automatically injected after Read.", required=False),
             ToolParameter(name="expected_size_bytes", type="integer", description="Read snapshot size, automatically injected after Read.", required=False),
             ToolParameter(name="dry_run", type="boolean", description="Preview without writing. Defaults to false.", required=False, default=False),
         ]
+
+
+def _windows(old: str, regions: list[tuple[int, int, str]], context: int) -> list[tuple[int, int, str]]:
+    """``(begin, stop, new text)`` line spans of ``old`` around the regions, merged when they touch."""
+    windows: list[list[Any]] = []  # [begin, stop, new text up to ``end``, end of the last region]
+    for start, end, new in regions:
+        begin, stop = _line_span(old, start, end, context)
+        if windows and begin <= windows[-1][1]:
+            windows[-1][1:] = [stop, windows[-1][2] + old[windows[-1][3] : start] + new, end]
+        else:
+            windows.append([begin, stop, old[begin:start] + new, end])
+    return [(begin, stop, text + old[end:stop]) for begin, stop, text, end in windows]
+
+
+def _changed_region(old: str, new: str) -> tuple[int, int, str]:
+    """The single region, on whole lines, where replacing ``old`` by ``new`` changes anything."""
+    old_lines, new_lines = old.splitlines(True), new.splitlines(True)
+    head = len(os.path.commonprefix([old_lines, new_lines]))
+    tail = len(os.path.commonprefix([old_lines[head:][::-1], new_lines[head:][::-1]]))
+    start, kept = sum(map(len, old_lines[:head])), sum(map(len, old_lines[len(old_lines) - tail :]))
+    return start, len(old) - kept, new[start : len(new) - kept]
+
+
+def _line_span(text: str, start: int, end: int, context: int) -> tuple[int, int]:
+    """Whole lines holding ``text[start:end]``, widened by ``context`` lines above and below."""
+    begin = text.rfind("\n", 0, start) + 1
+    stop = end if end and text[end - 1] == "\n" else text.find("\n", end) + 1 or len(text)
+    for _ in range(context):
+        begin, stop = text.rfind("\n", 0, max(begin - 1, 0)) + 1, text.find("\n", stop) + 1 or len(text)
+    return begin, stop
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import itertools
 import time
 from pathlib import Path
 from typing import Any
@@ -13,8 +14,10 @@ from tools.workspace import FileWorkspace, WorkspaceError
 from ._search_paths import (
     DEFAULT_RESULT_LIMIT,
     MAX_RESULT_LIMIT,
+    filter_paths,
+    glob_depth,
+    glob_prefix,
     iter_files,
-    path_matches,
     resolve_search_directory,
     visible_name,
 )
@@ -73,26 +76,28 @@ class GlobTool(Tool):
             return self._workspace_error(error, params_input)
 
         if pattern is None:
+            children = sorted(root.iterdir(), key=lambda item: item.name)
+            visited = len(children)
             candidates = [
                 child
-                for child in sorted(root.iterdir(), key=lambda item: item.name)
+                for child in children
                 if visible_name(
                     child.name,
                     include_hidden=include_hidden,
                     include_ignored=include_ignored,
                 )
                 and not child.is_symlink()
-            ]
+            ][: limit + 1]
         else:
-            candidates = [
-                candidate
-                for candidate in iter_files(
-                    root,
-                    include_hidden=include_hidden,
-                    include_ignored=include_ignored,
-                )
-                if path_matches(candidate.relative_to(root).as_posix(), pattern)
-            ]
+            examined = itertools.count()
+            files = iter_files(
+                root, include_hidden=include_hidden, include_ignored=include_ignored,
+                index=self.workspace.file_index(), prefix=glob_prefix(pattern), max_depth=glob_depth(pattern),
+            )
+            # zip pulls a walked file before each tick, so the counter ends at the number examined.
+            counted = (path for path, _ in zip(files, examined))
+            candidates = list(itertools.islice(filter_paths(pattern, counted, root), limit + 1))
+            visited = next(examined)
 
         paths = [self.workspace.relative(candidate) for candidate in candidates]
         truncated = len(paths) > limit
@@ -106,7 +111,7 @@ class GlobTool(Tool):
                 text=text,
                 params_input=params_input,
                 time_ms=elapsed,
-                extra_stats={"matched": len(paths), "visited": len(candidates)},
+                extra_stats={"matched": len(paths), "visited": visited},
                 path_resolved=rel_root,
             )
         return self.success_result(
@@ -114,7 +119,7 @@ class GlobTool(Tool):
             text=text,
             params_input=params_input,
             time_ms=elapsed,
-            extra_stats={"matched": len(paths), "visited": len(candidates)},
+            extra_stats={"matched": len(paths), "visited": visited},
             path_resolved=rel_root,
         )
 
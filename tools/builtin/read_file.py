@@ -4,7 +4,11 @@
 提供带行号的文本读取能力，为代码编辑场景优化。
 """
 
+import threading
 import time
+from array import array
+from collections import OrderedDict
+from itertools import accumulate
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
@@ -26,6 +30,11 @@ class ReadTool(Tool):
     # 格式: {absolute_path: last_mtime_ns}
     _mtime_cache: Dict[str, int] = {}
 
+    # 严格 UTF-8 文件的行起始字节偏移（末尾附文件长度），键为 (路径, mtime_ns, size)；翻页时直接 seek
+    _line_offsets: "OrderedDict[tuple[str, int, int], array]" = OrderedDict()
+    MAX_LINE_INDEXES = 64
+    _line_offsets_lock = threading.Lock()
+
     def __init__(
         self,
         name: str = "Read",
@@ -113,8 +122,12 @@ class ReadTool(Tool):
             )
 
         rel_path = self._workspace.relative(target)
+        # 本次调用的缓存命中情况；进程级累计值留在 TEXT_CACHE.stats 供遥测使用
+        cache_counts = {"line_index_hits": 0, "content_cache_hits": 0, "content_cache_misses": 0}
         try:
-            raw_content, encoding_used, fallback_used, snapshot = self._workspace.read_text(path)
+            all_lines, total_lines, encoding_used, fallback_used, snapshot = self._read_page(
+                path, start_line, limit, cache_counts
+            )
         except WorkspaceError as error:
             return self._workspace_error_response(
                 error,
@@ -133,7 +146,7 @@ class ReadTool(Tool):
             and ReadTool._mtime_cache[cache_key] != file_mtime_ns
         )
         ReadTool._mtime_cache[cache_key] = file_mtime_ns
-        content, total_lines = self._read_file_content(raw_content, start_line, limit)
+        content = self._read_file_content(all_lines, start_line)
 
         # =====================================================================
         # start_line 边界检查
@@ -184,44 +197,41 @@ class ReadTool(Tool):
             modified_externally=modified_externally,
             time_ms=time_ms,
             params_input=params_input,
+            cache_counts=cache_counts,
         )
 
-    def _read_file_content(
-        self, 
-        text: str,
-        start_line: int, 
-        limit: int,
-    ) -> tuple[str, int]:
-        """
-        读取文件内容并添加行号
-        
-        Args:
-            path: 文件路径
-            start_line: 起始行号 (1-based)
-            limit: 最大行数
-        
-        Returns:
-            (formatted_content, total_lines)
-        """
+    def _read_page(self, path: str, start_line: int, limit: int, cache_counts: Dict[str, int]):
+        """读取 [start_line, start_line + limit) 的行，返回 (lines, total_lines, encoding, fallback, snapshot)。
+        文件只打开一次：快照已有行偏移索引时只解码所需字节区间，否则整读并为严格 UTF-8 文件建索引。"""
+        indexed: List[array] = []
+
+        def locate(snapshot):
+            key = (str(snapshot.path), snapshot.mtime_ns, snapshot.size)
+            with ReadTool._line_offsets_lock:
+                offsets = ReadTool._line_offsets.get(key)
+                if offsets is None:
+                    return None
+                ReadTool._line_offsets.move_to_end(key)
+            indexed.append(offsets)
+            last = len(offsets) - 1
+            return offsets[min(start_line - 1, last)], offsets[min(start_line - 1 + limit, last)]
+        read = self._workspace.read_text(path, cache_counts=cache_counts, span=locate)
+        text, encoding_used, fallback_used, snapshot = read
+        if indexed:
+            cache_counts["line_index_hits"] += 1
+            return text.splitlines(keepends=True), len(indexed[0]) - 1, encoding_used, False, snapshot
         all_lines = text.splitlines(keepends=True)
-        
-        total_lines = len(all_lines)
-        
-        # 空文件处理
-        if total_lines == 0:
-            return "", 0
-        
-        # 提取目标行（支持分页）
-        start_idx = start_line - 1  # 转换为 0-based
-        end_idx = min(start_idx + limit, total_lines)
-        
-        # 如果 start_line 超出范围，返回空内容（后续会检测并报错）
-        if start_idx >= total_lines:
-            return "", total_lines
-        
-        # 提取指定范围的行
-        selected_lines = all_lines[start_idx:end_idx]
-        
+        if not fallback_used:
+            offsets = array("q", accumulate((len(line.encode("utf-8")) for line in all_lines), initial=0))
+            with ReadTool._line_offsets_lock:
+                ReadTool._line_offsets[(str(snapshot.path), snapshot.mtime_ns, snapshot.size)] = offsets
+                while len(ReadTool._line_offsets) > self.MAX_LINE_INDEXES:
+                    ReadTool._line_offsets.popitem(last=False)
+        page = all_lines[start_line - 1 : start_line - 1 + limit]
+        return page, len(all_lines), encoding_used, fallback_used, snapshot
+
+    def _read_file_content(self, selected_lines: List[str], start_line: int) -> str:
+        """为已选中的行添加行号"""
         # 格式化输出："%4d | %s\n"（行号占 4 位，右对齐）
         formatted_parts = []
         for i, line in enumerate(selected_lines, start=start_line):
@@ -229,9 +239,7 @@ class ReadTool(Tool):
             line_content = line.rstrip("\n\r")
             formatted_parts.append(f"{i:4d} | {line_content}\n")
         
-        content = "".join(formatted_parts)
-        
-        return content, total_lines
+        return "".join(formatted_parts)
 
     def _workspace_error_response(
         self,
@@ -281,6 +289,7 @@ class ReadTool(Tool):
         modified_externally: bool,
         time_ms: int,
         params_input: Dict[str, Any],
+        cache_counts: Dict[str, int],
     ) -> ToolResult:
         """
         构建标准化响应
@@ -368,6 +377,7 @@ class ReadTool(Tool):
             "file_size_bytes": file_size,
             "file_mtime_ms": file_mtime_ms,  # 乐观锁所需
             "encoding": encoding_used,
+            **cache_counts,
         }
         
         # 根据状态返回不同类型的响应
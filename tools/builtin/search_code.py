@@ -3,22 +3,33 @@
 from __future__ import annotations
 
 import json
+import mmap
+import multiprocessing
+import os
 import re
 import shutil
 import subprocess
+import threading
 import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from collections.abc import Iterable, Iterator
 from pathlib import Path
 from typing import Any, TypedDict
 
 from prompts.tools_prompts.grep_prompt import grep_prompt
 from tools.base import ErrorCode, Tool, ToolParameter, ToolResult
-from tools.workspace import FileWorkspace, WorkspaceError
+from tools.workspace import FileIndex, FileWorkspace, WorkspaceError
 
+from ._trigram_index import required_trigrams, trigram_index_for
 from ._search_paths import (
+    DEFAULT_IGNORED_NAMES,
     DEFAULT_RESULT_LIMIT,
     MAX_RESULT_LIMIT,
+    filter_paths,
+    glob_depth,
+    glob_prefix,
     iter_files,
-    path_matches,
     resolve_search_directory,
 )
 
@@ -29,10 +40,100 @@ class MatchItem(TypedDict):
     text: str
 
 
+_FALLBACK_POOL: ProcessPoolExecutor | None = None
+_FALLBACK_POOL_LOCK = threading.Lock()
+
+
+def _fallback_pool() -> ProcessPoolExecutor:
+    global _FALLBACK_POOL
+    with _FALLBACK_POOL_LOCK:
+        if _FALLBACK_POOL is None:
+            # spawn: forking a process that runs tool threads can copy held locks.
+            _FALLBACK_POOL = ProcessPoolExecutor(mp_context=multiprocessing.get_context("spawn"))
+        return _FALLBACK_POOL
+
+
+def _drop_fallback_pool(pool: ProcessPoolExecutor) -> None:
+    """Forget a broken pool so the next Grep builds a fresh one."""
+    global _FALLBACK_POOL
+    with _FALLBACK_POOL_LOCK:
+        if _FALLBACK_POOL is pool:
+            _FALLBACK_POOL = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _bytes_prefilter(pattern: str, flags: int) -> re.Pattern[bytes] | None:
+    """A bytes regex that never misses a line match, or None when that is not guaranteed."""
+    unsafe = any(char in pattern for char in "\\[^$") or "(?" in pattern
+    if unsafe or flags & re.IGNORECASE or not pattern.isascii() or not pattern.isprintable():
+        return None
+    # A str "." is one character, which is one to four UTF-8 bytes and never b"\n".
+    return re.compile(pattern.replace(".", "(?:.{1,4})").encode("ascii"))
+
+
+_MMAP_MIN_BYTES = 4 * 1024 * 1024
+# The UTF-8 encodings of every boundary str.splitlines() breaks on.
+_LINE_BREAKS = re.compile(rb"\r\n|[\n\r\v\f\x1c-\x1e]|\xc2\x85|\xe2\x80[\xa8\xa9]")
+
+
+def _mapped_lines(mapped: mmap.mmap, prefilter: re.Pattern[bytes] | None) -> Iterator[tuple[int, str]]:
+    """Numbered lines of a mapped file, decoding only the b"\n" records a prefilter hit lands in."""
+    with mapped:
+        number, counted, position = 1, 0, 0
+        while position < len(mapped):
+            start = position
+            if prefilter is not None:
+                hit = prefilter.search(mapped, position)
+                if hit is None:
+                    return
+                start = mapped.rfind(b"\n", 0, hit.start()) + 1
+            end = mapped.find(b"\n", start) + 1 or len(mapped)
+            number += sum(1 for _ in _LINE_BREAKS.finditer(mapped, counted, start))
+            counted = position = end
+            # Records end at b"\n", so splitting each keeps str.splitlines() numbering.
+            lines = mapped[start:end].decode("utf-8", errors="replace").splitlines()
+            yield from enumerate(lines, start=number)
+            number += len(lines)
+
+
+def _file_lines(path: str, prefilter: re.Pattern[bytes] | None) -> Iterable[tuple[int, str]] | None:
+    """Numbered lines of one file, or None when the prefilter rules it out; large files stay mapped."""
+    with open(path, "rb") as handle:
+        if os.fstat(handle.fileno()).st_size < _MMAP_MIN_BYTES:
+            raw = handle.read()
+            if prefilter is not None and prefilter.search(raw) is None:
+                return None
+            return enumerate(raw.decode("utf-8", errors="replace").splitlines(), start=1)
+        mapped = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+    return _mapped_lines(mapped, prefilter)
+
+
+def _scan_files(files: list[tuple[str, str]], pattern: str, flags: int, limit: int) -> list[MatchItem]:
+    """Search one sorted chunk of text files; module level so pool workers can import it."""
+    compiled, prefilter = re.compile(pattern, flags), _bytes_prefilter(pattern, flags)
+    matches: list[MatchItem] = []
+    for path, relative in files:
+        try:
+            lines = _file_lines(path, prefilter)
+        except (OSError, ValueError):
+            continue
+        for line_number, line in lines or ():
+            if compiled.search(line):
+                matches.append({"file": relative, "line": line_number, "text": line})
+                if len(matches) > limit:
+                    return matches
+    return matches
+
+
 class GrepTool(Tool):
     """Search text files with ripgrep when available and one Python fallback."""
 
     timeout_seconds = 2.0
+    # The rg deadline grows by one second per this many files in the searched tree.
+    timeout_files_per_second = 20_000
+    fallback_chunk_files = 128
+    # Trigram survivors go to rg as argv; beyond this many, rg searching root is cheaper and safe.
+    max_narrowed_files = 2_000
     max_line_chars = 2_000
     _line_truncation_marker = "… [truncated]"
 
@@ -84,11 +185,21 @@ class GrepTool(Tool):
         except WorkspaceError as error:
             return self._workspace_error(error, params_input)
 
-        candidates = self._text_candidates(root, glob)
+        # Without a glob, rg walks the root itself; Python globs keep an explicit file list.
+        candidates = self._text_candidates(root, glob) if glob is not None else None
+        trigram_index = trigram_index_for(self.workspace.root)
+        required = required_trigrams(pattern) if trigram_index is not None else set()
+        if required and candidates is None:
+            # Narrow the raw walk and text-check only survivors; past the cap rg walks root itself.
+            narrowed = trigram_index.narrow(iter_files(root, index=self.workspace.file_index()), required)
+            candidates = self._text_only(narrowed) if len(narrowed) <= self.max_narrowed_files else None
+        elif required:
+            candidates = trigram_index.narrow(candidates, required)
         fallback_reason: str | None = None
+        first_match_ms: int | None = None
         if shutil.which("rg") is not None:
             try:
-                matches = self._rg_matches(
+                matches, searched_files, first_match_ms = self._rg_matches(
                     root=root,
                     candidates=candidates,
                     pattern=pattern,
@@ -97,13 +208,13 @@ class GrepTool(Tool):
                 )
             except _UnsupportedRipgrepPattern:
                 fallback_reason = "rg_unsupported_pattern"
-                matches = self._python_matches(candidates, compiled)
             except (OSError, subprocess.TimeoutExpired):
                 fallback_reason = "rg_failed"
-                matches = self._python_matches(candidates, compiled)
         else:
             fallback_reason = "rg_not_found"
-            matches = self._python_matches(candidates, compiled)
+        if fallback_reason is not None:
+            candidates = candidates if candidates is not None else self._text_candidates(root, None)
+            matches, searched_files = self._python_matches(candidates, compiled, limit), len(candidates)
 
         matches.sort(key=lambda item: (item["file"], item["line"], item["text"]))
         truncation_reasons: list[str] = []
@@ -115,6 +226,7 @@ class GrepTool(Tool):
             truncation_reasons.append("line_length")
         truncated = bool(truncation_reasons)
         elapsed = int((time.monotonic() - started) * 1000)
+        stats = {"matched_lines": len(matches), "searched_files": searched_files, "first_match_ms": first_match_ms}
         data: dict[str, Any] = {"matches": matches, "truncated": truncated}
         if truncation_reasons:
             data["truncation_reasons"] = truncation_reasons
@@ -131,7 +243,7 @@ class GrepTool(Tool):
                 text=text,
                 params_input=params_input,
                 time_ms=elapsed,
-                extra_stats={"matched_lines": len(matches), "searched_files": len(candidates)},
+                extra_stats=stats,
                 path_resolved=rel_root,
             )
         return self.success_result(
@@ -139,7 +251,7 @@ class GrepTool(Tool):
             text=text,
             params_input=params_input,
             time_ms=elapsed,
-            extra_stats={"matched_lines": len(matches), "searched_files": len(candidates)},
+            extra_stats=stats,
             path_resolved=rel_root,
         )
 
@@ -147,45 +259,86 @@ class GrepTool(Tool):
         self,
         *,
         root: Path,
-        candidates: list[Path],
+        candidates: list[Path] | None,
         pattern: str,
         case_sensitive: bool,
         limit: int,
-    ) -> list[MatchItem]:
-        if not candidates:
-            return []
+    ) -> tuple[list[MatchItem], int, int | None]:
+        """Stream rg over ``candidates`` (None: ``root``); ``--sort=path`` orders per component (``a/b.py``
+        before ``a-c.py``), so rg stops at ``limit + 1`` only if that is this tree's string order."""
+        if candidates is not None and not candidates:
+            return [], 0, None
         command = ["rg", "--json", "--line-number", "--no-heading", "--color=never"]
+        command.extend(["--no-messages", "--sort=path"])
         if not case_sensitive:
             command.append("--ignore-case")
+        if candidates is None:
+            # Mirror iter_files: no ignore files, symlinks, ignored names or dotfiles; binaries drop below.
+            command.extend(["--no-ignore", "--no-follow", "--text"])
+            command.extend(f"--glob=!{name}" for name in sorted(DEFAULT_IGNORED_NAMES))
         command.extend(["--max-count", str(limit + 1), "-e", pattern, "--"])
-        command.extend(candidate.relative_to(root).as_posix() for candidate in candidates)
-        completed = subprocess.run(
+        index = self.workspace.file_index()
+        tree = candidates if candidates is not None else iter_files(root, index=index)
+        files = [path.relative_to(root).as_posix() for path in tree]
+        command.extend(["."] if candidates is None else files)
+        ordered = sorted(files) == sorted(files, key=lambda name: name.split("/"))
+        timeout, started = self.timeout_seconds + len(files) / self.timeout_files_per_second, time.monotonic()
+        process = subprocess.Popen(
             command,
             cwd=root,
-            check=False,
-            capture_output=True,
+            stdout=subprocess.PIPE, stderr=subprocess.PIPE,
             encoding="utf-8",
             errors="replace",
-            timeout=self.timeout_seconds,
         )
-        if completed.returncode == 2:
-            raise _UnsupportedRipgrepPattern(completed.stderr.strip() or "ripgrep rejected the pattern")
-        if completed.returncode not in (0, 1):
-            raise OSError(completed.stderr.strip() or "ripgrep failed")
+        watchdog = threading.Timer(timeout, process.kill)
+        watchdog.start()
+        try:
+            matches, searched_files, first_match_ms = self._read_rg_events(
+                process.stdout, root, candidates, index, limit if ordered else None, started
+            )
+        finally:
+            watchdog.cancel()
+            if process.poll() is None:
+                process.kill()
+            _, stderr = process.communicate()
+        if ordered and len(matches) > limit:
+            return matches, searched_files, first_match_ms
+        if process.returncode < 0:
+            raise subprocess.TimeoutExpired(command, timeout)
+        if process.returncode == 2:
+            raise _UnsupportedRipgrepPattern(stderr.strip() or "ripgrep rejected the pattern")
+        if process.returncode not in (0, 1):
+            raise OSError(stderr.strip() or "ripgrep failed")
+        return matches, searched_files, first_match_ms
+
+    def _read_rg_events(
+        self, lines: Iterable[str], root: Path, candidates: list[Path] | None, index: FileIndex,
+        limit: int | None, started: float,
+    ) -> tuple[list[MatchItem], int, int | None]:
+        """Collect matches until past ``limit`` (None: all) and files searched, or begun if rg was killed."""
         matches: list[MatchItem] = []
-        for raw_line in completed.stdout.splitlines():
-            event = json.loads(raw_line)
+        begun, searched_files, first_match_ms = 0, None, None
+        for raw_line in lines:
+            try:
+                event = json.loads(raw_line)
+            except ValueError:
+                break  # a line cut short by the watchdog kill
+            begun += event.get("type") == "begin"
+            if event.get("type") == "summary":
+                searched_files = event["data"]["stats"]["searches"]
             if event.get("type") != "match":
                 continue
             data = event["data"]
-            matches.append(
-                {
-                    "file": self.workspace.relative(root / data["path"]["text"]),
-                    "line": data["line_number"],
-                    "text": data["lines"]["text"].rstrip("\r\n"),
-                }
-            )
-        return matches
+            path = root / data["path"]["text"]
+            if candidates is None and not index.is_text(path):
+                continue
+            text = data["lines"]["text"].rstrip("\r\n")
+            matches.append({"file": self.workspace.relative(path), "line": data["line_number"], "text": text})
+            if first_match_ms is None:
+                first_match_ms = int((time.monotonic() - started) * 1000)
+            if limit is not None and len(matches) > limit:
+                break
+        return matches, begun if searched_files is None else searched_files, first_match_ms
 
     def _bound_line_text(self, matches: list[MatchItem]) -> tuple[list[MatchItem], bool]:
         """Cap each returned line so one match cannot exhaust the tool-result budget."""
@@ -200,36 +353,43 @@ class GrepTool(Tool):
             bounded.append({**match, "text": text})
         return bounded, truncated
 
-    def _python_matches(self, candidates: list[Path], pattern: re.Pattern[str]) -> list[MatchItem]:
+    def _python_matches(self, candidates: list[Path], pattern: re.Pattern, limit: int) -> list[MatchItem]:
+        """Scan sorted chunks, in worker processes when there are several, until ``limit + 1`` match."""
+        files = [(str(candidate), self.workspace.relative(candidate)) for candidate in candidates]
+        files.sort(key=lambda item: item[1])
+        size = self.fallback_chunk_files
+        chunks = [files[start : start + size] for start in range(0, len(files), size)]
+        args, pool = (pattern.pattern, pattern.flags, limit), _fallback_pool() if len(chunks) > 1 else None
+        try:
+            pending = [pool.submit(_scan_files, chunk, *args) for chunk in chunks] if pool else []
+        except (BrokenProcessPool, OSError):
+            _drop_fallback_pool(pool)
+            pending = []
         matches: list[MatchItem] = []
-        for candidate in candidates:
-            relative = self.workspace.relative(candidate)
+        for position, chunk in enumerate(chunks):
             try:
-                content, _, _, _ = self.workspace.read_text(relative)
-            except WorkspaceError as error:
-                if error.kind in {"binary", "not_regular", "not_found", "io", "conflict"}:
-                    continue
-                raise
-            for line_number, line in enumerate(content.splitlines(), start=1):
-                if pattern.search(line):
-                    matches.append({"file": relative, "line": line_number, "text": line})
+                found = pending[position].result() if pending else None
+            except (BrokenProcessPool, OSError):
+                # A worker died or could not spawn; the rest of this search runs in-process.
+                _drop_fallback_pool(pool)
+                pending, found = [], None
+            matches.extend(_scan_files(chunk, *args) if found is None else found)
+            if len(matches) > limit:
+                break
+        for future in pending:
+            future.cancel()
         return matches
 
     def _text_candidates(self, root: Path, glob: str | None) -> list[Path]:
+        limits = {"prefix": glob_prefix(glob), "max_depth": glob_depth(glob)} if glob is not None else {}
+        files = iter_files(root, index=self.workspace.file_index(), **limits)
+        return self._text_only(filter_paths(glob, files, root) if glob is not None else files)
+
+    def _text_only(self, files: Iterable[Path]) -> list[Path]:
         """Apply the workspace's regular-text boundary before either engine runs."""
-        candidates: list[Path] = []
-        for candidate in iter_files(root):
-            relative_from_root = candidate.relative_to(root).as_posix()
-            if glob is not None and not path_matches(relative_from_root, glob):
-                continue
-            try:
-                self.workspace.inspect(self.workspace.relative(candidate))
-            except WorkspaceError as error:
-                if error.kind in {"binary", "not_regular", "not_found", "io", "conflict"}:
-                    continue
-                raise
-            candidates.append(candidate)
-        return candidates
+        index, check_size = self.workspace.file_index(), self.workspace.binary_check_size
+        # Walked entries are non-symlinks under the confined root; only the text check remains.
+        return [candidate for candidate in files if index.is_text(candidate, check_size)]
 
     def _invalid(self, message: str, params_input: dict[str, Any]) -> ToolResult:
         return self.error_result(
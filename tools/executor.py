@@ -24,7 +24,9 @@ class ToolExecutor:
             permission_checker=permission_checker or (lambda _name: True)
         )
 
-    def execute(self, name: str, input_text: Any, *, trace_logger=None, step: int = 0) -> ToolResult:
+    def execute(
+        self, name: str, input_text: Any, *, trace_logger=None, step: int = 0, cache_reads: bool = True
+    ) -> ToolResult:
         parameters = self.registry.prepare_parameters(input_text)
 
         permission_payload = self._decide_permission(name, parameters, trace_logger=trace_logger, step=step)
@@ -70,7 +72,7 @@ class ToolExecutor:
             )
 
         self.registry.record_execution_result(name, result_payload)
-        if name == "Read":
+        if name == "Read" and cache_reads:
             self.registry.cache_read_result(result_payload, parameters)
 
         return result_payload
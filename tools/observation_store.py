@@ -291,6 +291,16 @@ class ObservationTruncator:
             logger.warning("Failed to save full output: %s", e)
             return None
     
+    @property
+    def output_dir(self) -> Path:
+        """The resolved output directory, confined to the project root."""
+        return self._output_dir
+
+    def spill_path(self, tool_name: str, label: str) -> Path:
+        """A fresh path in the output directory for a tool to stream oversized raw output into."""
+        self._output_dir.mkdir(parents=True, exist_ok=True)
+        return self._output_dir / f"tool_{datetime.now():%Y%m%d_%H%M%S_%f}_{tool_name}_{label}.log"
+
     def _build_hint(
         self,
         tool_name: str,
@@ -329,7 +339,7 @@ class ObservationTruncator:
             retention_days = _get_retention_days()
             cutoff = datetime.now() - timedelta(days=retention_days)
             
-            for filepath in self._output_dir.glob("tool_*.json"):
+            for filepath in self._output_dir.glob("tool_*"):
                 try:
                     mtime = datetime.fromtimestamp(filepath.stat().st_mtime)
                     if mtime < cutoff:
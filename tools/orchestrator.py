@@ -2,10 +2,11 @@
 
 from __future__ import annotations
 
+import json
 import os
 import traceback as tb
 import uuid
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass, field
 from typing import Any, Protocol
 
@@ -69,6 +70,46 @@ class ToolOrchestrator:
 
     def __init__(self, host: Any):
         self.host = host
+        self._prefetched: dict[tuple[str, str], Future] = {}
+        self._prefetch_blocked = False
+        self._prefetch_pool: ThreadPoolExecutor | None = None
+
+    @staticmethod
+    def _prefetch_key(tool_name: str, tool_input: dict[str, Any]) -> tuple[str, str]:
+        return tool_name, json.dumps(tool_input, sort_keys=True, ensure_ascii=False)
+
+    def prefetch(self, call: dict[str, Any], *, step: int, trace_logger) -> None:
+        """Start a safe call while its response streams; ``run`` consumes it in order, then caches locks."""
+        tool_name = call.get("name") or "unknown_tool"
+        parsed_input, parse_error = parse_tool_input(call.get("arguments") or {})
+        if self._prefetch_blocked or not isinstance(parsed_input, dict):
+            return
+        executor = getattr(self.host, "tool_executor", None)
+        if executor is None or not self.is_concurrency_safe(tool_name, parse_error):
+            self._prefetch_blocked = True
+            return
+        key = self._prefetch_key(tool_name, parsed_input)
+        if key in self._prefetched:
+            return
+        if self._prefetch_pool is None:
+            self._prefetch_pool = ThreadPoolExecutor(max_workers=self._get_max_concurrency())
+        self._prefetched[key] = self._prefetch_pool.submit(
+            executor.execute, tool_name, parsed_input, trace_logger=trace_logger, step=step, cache_reads=False
+        )
+
+    def discard_prefetched(self) -> None:
+        """Cancel unconsumed prefetches so a later step never sees stale reads."""
+        for future in self._prefetched.values():
+            future.cancel()
+        self._prefetched.clear()
+        self._prefetch_blocked = False
+
+    def close(self) -> None:
+        """Drop pending prefetches and stop the prefetch workers."""
+        self.discard_prefetched()
+        if self._prefetch_pool is not None:
+            self._prefetch_pool.shutdown(wait=False, cancel_futures=True)
+            self._prefetch_pool = None
 
     def _get_transcript_run_id(self) -> str:
         run_id = getattr(self.host, "_active_transcript_run_id", None)
@@ -153,6 +194,7 @@ class ToolOrchestrator:
             self._log_batch_end(trace_logger, step, batch_index, batch, batch_observations)
             observations.extend(batch_observations)
 
+        self.discard_prefetched()
         observations = [self._normalize_empty_result(obs) for obs in observations]
         observations = [self._apply_observation_limit(obs) for obs in observations]
         return self._apply_result_budget(observations, step=step, trace_logger=trace_logger)
@@ -296,7 +338,12 @@ class ToolOrchestrator:
             trace_logger=trace_logger,
         )
         try:
-            if hasattr(host, "tool_executor") and host.tool_executor is not None:
+            prefetched = self._prefetched.pop(self._prefetch_key(tool_name, tool_input), None)
+            if prefetched is not None:
+                result = prefetched.result()
+                if tool_name == "Read":
+                    host.tool_executor.registry.cache_read_result(result, tool_input)
+            elif hasattr(host, "tool_executor") and host.tool_executor is not None:
                 result = host.tool_executor.execute(
                     tool_name,
                     tool_input,
@@ -289,55 +289,26 @@ class ToolRegistry:
     def _inject_optimistic_lock_params(self, tool_name: str, parameters: dict) -> dict:
         """
         为 Edit 工具自动注入乐观锁参数
-        
-        如果参数中缺少 expected_mtime_ms / expected_size_bytes，
-        尝试从 Read 缓存中查找并注入。
-        
-        Args:
-            tool_name: 工具名称
-            parameters: 原始参数
-            
-        Returns:
-            注入后的参数（可能与原始相同）
+
+        对顶层 path 及 batch 中每个缺少 expected_mtime_ms / expected_size_bytes 的文件，从 Read 缓存注入；
+        已提供的不覆盖，找不到缓存时不注入，让工具正常报错（提示先 Read）。
         """
-        # 如果已经提供了，不覆盖
-        if "expected_mtime_ms" in parameters and "expected_size_bytes" in parameters:
-            return parameters
-        
-        # 获取目标路径
-        path = parameters.get("path")
-        if not path:
-            return parameters
-        
-        # 尝试从缓存查找（先用原始 path，再用规范化 path）
-        meta = self._read_cache.get(path)
-        if not meta:
-            # 尝试规范化路径匹配
-            # 注意：这里的规范化逻辑应与工具内部一致
+        batch = parameters.get("batch")
+        for entry in [parameters, *batch] if isinstance(batch, list) else [parameters]:
+            path = entry.get("path") if isinstance(entry, dict) else None
+            if not isinstance(path, str) or not path or ("expected_mtime_ms" in entry and "expected_size_bytes" in entry):
+                continue
+            # 先用原始 path，再用规范化 path（与工具内部一致）
             normalized_path = path.replace("\\", "/")
             if normalized_path.startswith("./"):
                 normalized_path = normalized_path[2:]
-            meta = self._read_cache.get(normalized_path)
-        
-        if meta:
-            # 找到缓存，注入参数
-            if "expected_mtime_ms" not in parameters:
-                parameters["expected_mtime_ms"] = meta["file_mtime_ms"]
-            if "expected_size_bytes" not in parameters:
-                parameters["expected_size_bytes"] = meta["file_size_bytes"]
-            logger.debug(
-                f"[OptimisticLock] Auto-injected for {tool_name}: "
-                f"mtime={meta['file_mtime_ms']}, size={meta['file_size_bytes']}, path={path}"
-            )
-        else:
-            # 未找到缓存，让工具正常报错（提示先 Read）
-            logger.debug(
-                f"[OptimisticLock] No Read cache found for path '{path}'. "
-                f"Tool will report INVALID_PARAM if file exists."
-            )
-        
+            meta = self._read_cache.get(path) or self._read_cache.get(normalized_path)
+            if meta:
+                entry.setdefault("expected_mtime_ms", meta["file_mtime_ms"])
+                entry.setdefault("expected_size_bytes", meta["file_size_bytes"])
+            logger.debug(f"[OptimisticLock] {tool_name} path={path}: {'injected' if meta else 'no Read cache'}")
         return parameters
-    
+
     def _cache_read_meta(self, result: ToolResult, params_input: dict) -> None:
         """
         缓存 Read 工具的元信息（用于后续 Edit 的乐观锁校验）
@@ -2,11 +2,17 @@
 
 from __future__ import annotations
 
+import atexit
+from collections import OrderedDict
+from collections.abc import Callable
+import contextlib
 from dataclasses import dataclass
 import os
 from pathlib import Path
+import shutil
 import stat
 import tempfile
+import threading
 
 
 class WorkspaceError(Exception):
@@ -30,6 +36,151 @@ class FileSnapshot:
         return self.mtime_ns // 1_000_000
 
 
+class FileIndex:
+    """Directory listings for one root, reused while a directory's mtime (bumped by entry changes) holds."""
+
+    def __init__(self) -> None:
+        self._listings: dict[Path, tuple[int, list[str], list[tuple[str, int, int]]]] = {}
+        self._text: dict[Path, tuple[int, int, bool]] = {}
+
+    def listing(self, directory: Path) -> tuple[list[str], list[tuple[str, int, int]]]:
+        """Sorted non-symlink subdirectory names and ``(name, size, mtime_ns)`` files."""
+        try:
+            mtime_ns, cached = os.stat(directory).st_mtime_ns, self._listings.get(directory)
+            if cached is not None and cached[0] == mtime_ns:
+                return cached[1], cached[2]
+            directories: list[str] = []
+            files: list[tuple[str, int, int]] = []
+            with os.scandir(directory) as entries:
+                for entry in (entry for entry in entries if not entry.is_symlink()):
+                    if entry.is_dir():
+                        directories.append(entry.name)
+                    else:  # DirEntry caches its stat
+                        files.append((entry.name, entry.stat().st_size, entry.stat().st_mtime_ns))
+        except OSError:
+            return [], []
+        self._listings[directory] = (mtime_ns, sorted(directories), sorted(files))
+        return self._listings[directory][1:]
+
+    def is_text(self, path: Path, check_size: int = 8192) -> bool:
+        """Whether a regular file has no NUL byte in its head, cached per size and mtime."""
+        try:
+            file_stat, cached = path.stat(), self._text.get(path)
+            if cached is not None and cached[:2] == (file_stat.st_mtime_ns, file_stat.st_size):
+                return cached[2]
+            text = stat.S_ISREG(file_stat.st_mode)
+            if text:
+                with path.open("rb") as handle:
+                    text = b"\x00" not in handle.read(check_size)
+        except OSError:
+            return False
+        self._text[path] = (file_stat.st_mtime_ns, file_stat.st_size, text)
+        return text
+
+
+class TextCache:
+    """Bounded-bytes LRU of decoded file text keyed by the exact ``FileSnapshot`` read."""
+
+    def __init__(self, max_bytes: int = 32 * 1024 * 1024) -> None:
+        self.max_bytes, self.stats = max_bytes, {"content_cache_hits": 0, "content_cache_misses": 0}
+        self._entries: OrderedDict[FileSnapshot, tuple[str, str, bool]] = OrderedDict()
+        self._bytes, self._lock = 0, threading.Lock()
+
+    def get(self, snapshot: FileSnapshot, counts: dict[str, int] | None = None) -> tuple[str, str, bool] | None:
+        """Look up ``snapshot``, tallying the outcome in the process-wide ``stats`` and in ``counts``."""
+        with self._lock:
+            entry = self._entries.get(snapshot)
+            outcome = "content_cache_hits" if entry else "content_cache_misses"
+            for tally in (self.stats, counts if counts is not None else {}):
+                tally[outcome] = tally.get(outcome, 0) + 1
+            if entry:
+                self._entries.move_to_end(snapshot)
+            return entry
+
+    def put(self, snapshot: FileSnapshot, entry: tuple[str, str, bool]) -> None:
+        with self._lock:
+            if snapshot.size > self.max_bytes or snapshot in self._entries:
+                return
+            self._entries[snapshot] = entry
+            self._bytes += snapshot.size
+            while self._bytes > self.max_bytes:
+                self._bytes -= self._entries.popitem(last=False)[0].size
+
+    def invalidate(self, path: Path) -> None:
+        """Drop every entry for ``path``; writers call this so same-mtime rewrites never hit."""
+        with self._lock:
+            for snapshot in [key for key in self._entries if key.path == path]:
+                self._bytes -= snapshot.size
+                del self._entries[snapshot]
+
+
+def _fsync_path(path: Path, *, directory: bool = False) -> None:
+    if directory and not hasattr(os, "O_DIRECTORY"):
+        return
+    with contextlib.suppress(FileNotFoundError):
+        fd = os.open(path, os.O_RDONLY | (os.O_DIRECTORY if directory else 0))
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+
+class DurabilityPolicy:
+    """When renames reach disk: ``always`` at once, ``group`` per time/byte window, else at ``flush()``."""
+
+    MODES = frozenset({"always", "group", "on_run_end"})
+
+    def __init__(self, mode: str = "always", window_seconds: float = 0.05, window_bytes: int = 8 * 1024 * 1024) -> None:
+        self.mode = mode if mode in self.MODES else "always"
+        self.window_seconds, self.window_bytes = window_seconds, window_bytes
+        self._pending: dict[Path, None] = {}
+        self._deadline: threading.Timer | None = None
+        self._pending_bytes, self._lock = 0, threading.Lock()
+
+    def set_mode(self, mode: str) -> None:
+        """Apply ``Config.workspace_durability``, first flushing whatever the old mode queued."""
+        self.flush()
+        self.mode = mode if mode in self.MODES else "always"
+
+    def renamed(self, paths: list[Path], size: int) -> None:
+        """Make renamed ``paths`` durable now under ``always``, else queue them with their directories."""
+        if self.mode == "always":
+            for directory in {path.parent for path in paths}:
+                _fsync_path(directory, directory=True)
+            return
+        with self._lock:
+            if self.mode == "group" and self._deadline is None:
+                # The timer bounds how long a quiet window can stay unsynced.
+                self._deadline = threading.Timer(self.window_seconds, self.flush)
+                self._deadline.daemon = True
+                self._deadline.start()
+            self._pending.update(dict.fromkeys(paths))
+            self._pending_bytes += size
+            full = self._pending_bytes >= self.window_bytes
+        if full and self.mode == "group":
+            self.flush()
+
+    def flush(self) -> None:
+        """Fsync every queued file, then each of their directories once."""
+        with self._lock:
+            pending, self._pending, self._pending_bytes = self._pending, {}, 0
+            deadline, self._deadline = self._deadline, None
+        if deadline is not None:
+            deadline.cancel()
+        for path in pending:
+            _fsync_path(path)
+        for directory in {path.parent for path in pending}:
+            _fsync_path(directory, directory=True)
+
+
+TEXT_CACHE = TextCache()
+# The host applies ``Config.workspace_durability``; ``always`` keeps standalone tool use safe.
+WORKSPACE_DURABILITY = DurabilityPolicy()
+atexit.register(WORKSPACE_DURABILITY.flush)
+_FILE_INDEXES: dict[Path, FileIndex] = {}
+_FILE_INDEXES_LOCK = threading.Lock()
+
+
 class FileWorkspace:
     """Resolve and update regular text files beneath one project root."""
 
@@ -54,6 +205,11 @@ class FileWorkspace:
             raise WorkspaceError("io", f"Path resolution failed: {error}") from error
         return target
 
+    def file_index(self) -> FileIndex:
+        """The discovery index shared by every workspace on this root in the process."""
+        with _FILE_INDEXES_LOCK:
+            return _FILE_INDEXES.setdefault(self.root, FileIndex())
+
     def relative(self, target: Path) -> str:
         relative = target.relative_to(self.root)
         return str(relative) or "."
@@ -62,66 +218,97 @@ class FileWorkspace:
         """Validate a readable regular text file and capture its current snapshot."""
         target = self.resolve(requested)
         try:
-            file_stat = target.stat()
-            if stat.S_ISDIR(file_stat.st_mode):
-                raise WorkspaceError("directory", f"Path '{requested}' is a directory.")
-            if not stat.S_ISREG(file_stat.st_mode):
-                raise WorkspaceError("not_regular", f"Path '{requested}' is not a regular file.")
+            snapshot = self._regular(requested, target, target.stat())
             if self._is_binary(target):
                 raise WorkspaceError("binary", f"File '{requested}' appears to be binary.")
         except FileNotFoundError as error:
             raise WorkspaceError("not_found", f"File '{requested}' does not exist.") from error
-        except WorkspaceError:
-            raise
         except OSError as error:
             raise WorkspaceError("io", f"Cannot access file: {error}") from error
-        return FileSnapshot(target, file_stat.st_mtime_ns, file_stat.st_size)
+        return snapshot
 
-    def read_text(self, requested: str) -> tuple[str, str, bool, FileSnapshot]:
-        """Read text consistently, rejecting a file changed while it was read."""
-        before = self.inspect(requested)
+    def read_text(
+        self, requested: str, *, cache_counts: dict[str, int] | None = None,
+        span: Callable[[FileSnapshot], tuple[int, int] | None] | None = None,
+    ) -> tuple[str, str, bool, FileSnapshot]:
+        """Read text through one descriptor, rejecting mid-read changes; ``span`` picks known UTF-8 bytes."""
+        target = self.resolve(requested)
         try:
-            raw = before.path.read_bytes()
+            # O_NONBLOCK keeps a FIFO from waiting for a writer; fstat rejects it before any read.
+            fd = os.open(target, os.O_RDONLY | getattr(os, "O_NONBLOCK", 0))
+            try:
+                before = self._regular(requested, target, os.fstat(fd))
+                picked = span(before) if span is not None else None
+                cached = TEXT_CACHE.get(before, cache_counts) if picked is None else None
+                if cached is not None:
+                    return (*cached, before)
+                start, stop = picked or (0, None)
+                with os.fdopen(fd, "rb", closefd=False) as handle:
+                    handle.seek(start)
+                    raw = handle.read(-1 if stop is None else stop - start)
+                after = self._regular(requested, target, os.fstat(fd))
+            finally:
+                os.close(fd)
+        except FileNotFoundError as error:
+            raise WorkspaceError("not_found", f"File '{requested}' does not exist.") from error
         except OSError as error:
             raise WorkspaceError("io", f"Failed to read file: {error}") from error
-        after = self.inspect(requested)
         if before != after:
             raise WorkspaceError("conflict", "File was modified while being read.")
-        try:
+        if picked is not None:
             return raw.decode("utf-8"), "utf-8", False, after
+        if b"\x00" in raw[: self.binary_check_size]:
+            raise WorkspaceError("binary", f"File '{requested}' appears to be binary.")
+        try:
+            entry = (raw.decode("utf-8"), "utf-8", False)
         except UnicodeDecodeError:
-            return raw.decode("utf-8", errors="replace"), "utf-8 (replace)", True, after
+            entry = (raw.decode("utf-8", errors="replace"), "utf-8 (replace)", True)
+        TEXT_CACHE.put(after, entry)
+        return (*entry, after)
 
     def atomic_write(self, requested: str, text: str, *, expected: FileSnapshot) -> int:
         """Atomically replace a file only if its exact read snapshot still matches."""
-        current = self.inspect(requested)
-        if current != expected:
-            raise WorkspaceError("conflict", "File has been modified since it was read.")
+        return self.atomic_write_many([(requested, text, expected)])[0]
 
-        encoded = text.encode("utf-8")
-        fd = -1
-        temporary = None
+    def atomic_write_many(self, writes: list[tuple[str, str, FileSnapshot]]) -> list[int]:
+        """Replace files as one batch: all staged and fsynced, then renamed only if every snapshot still matches."""
+        staged: list[tuple[Path, str]] = []
+        sizes: list[int] = []
+        renamed = 0
         try:
-            fd, temporary = tempfile.mkstemp(
-                prefix=".mycodeagent-", suffix=".tmp", dir=current.path.parent
-            )
-            with os.fdopen(fd, "wb") as handle:
-                fd = -1
-                os.fchmod(handle.fileno(), stat.S_IMODE(current.path.stat().st_mode))
-                handle.write(encoded)
-                handle.flush()
-                os.fsync(handle.fileno())
-            os.replace(temporary, current.path)
-            temporary = None
-            return len(encoded)
+            for requested, text, expected in writes:
+                current = self.inspect(requested)
+                if current != expected:
+                    raise WorkspaceError("conflict", "File has been modified since it was read.")
+                fd, temporary = tempfile.mkstemp(prefix=".mycodeagent-", suffix=".tmp", dir=current.path.parent)
+                staged.append((current.path, temporary))
+                with os.fdopen(fd, "wb") as handle:
+                    os.fchmod(handle.fileno(), stat.S_IMODE(current.path.stat().st_mode))
+                    sizes.append(handle.write(text.encode("utf-8")))
+                    handle.flush()
+                    if WORKSPACE_DURABILITY.mode == "always":
+                        os.fsync(handle.fileno())
+            if any(self.inspect(requested) != expected for requested, _text, expected in writes):
+                raise WorkspaceError("conflict", "File has been modified since it was read.")
+            for target, temporary in staged:
+                if len(staged) > 1:  # keep the original reachable until the batch commits
+                    try:
+                        os.link(target, temporary + ".orig")
+                    except OSError:  # FAT and some network or FUSE mounts refuse hard links
+                        shutil.copy2(target, temporary + ".orig")
+                os.replace(temporary, target)
+                TEXT_CACHE.invalidate(target)
+                renamed += 1
+            WORKSPACE_DURABILITY.renamed([target for target, _temporary in staged], sum(sizes))
+            return sizes
         finally:
-            if fd != -1:
-                os.close(fd)
-            if temporary is not None:
-                try:
-                    os.unlink(temporary)
-                except FileNotFoundError:
-                    pass
+            # Once every rename landed the batch is committed, even if the durability step failed.
+            for target, temporary in staged[:renamed] if 1 < len(staged) != renamed else ():
+                os.replace(temporary + ".orig", target)
+                TEXT_CACHE.invalidate(target)
+            for leftover in (name for _target, temporary in staged for name in (temporary, temporary + ".orig")):
+                with contextlib.suppress(FileNotFoundError):
+                    os.unlink(leftover)
 
     def atomic_create(self, requested: str, text: str) -> int:
         """Create one new text file without ever replacing a concurrent writer."""
@@ -140,11 +327,13 @@ class FileWorkspace:
                 fd = -1
                 handle.write(encoded)
                 handle.flush()
-                os.fsync(handle.fileno())
+                if WORKSPACE_DURABILITY.mode == "always":
+                    os.fsync(handle.fileno())
             try:
                 os.link(temporary, target)
             except FileExistsError as error:
                 raise WorkspaceError("conflict", "File was created concurrently.") from error
+            WORKSPACE_DURABILITY.renamed([target], len(encoded))
             os.unlink(temporary)
             temporary = None
             return len(encoded)
@@ -157,6 +346,14 @@ class FileWorkspace:
                 except FileNotFoundError:
                     pass
 
+    @staticmethod
+    def _regular(requested: str, target: Path, file_stat: os.stat_result) -> FileSnapshot:
+        if stat.S_ISDIR(file_stat.st_mode):
+            raise WorkspaceError("directory", f"Path '{requested}' is a directory.")
+        if not stat.S_ISREG(file_stat.st_mode):
+            raise WorkspaceError("not_regular", f"Path '{requested}' is not a regular file.")
+        return FileSnapshot(target, file_stat.st_mtime_ns, file_stat.st_size)
+
     def _is_binary(self, target: Path) -> bool:
         with target.open("rb") as handle:
             return b"\x00" in handle.read(self.binary_check_size)